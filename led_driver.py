@@ -18,6 +18,13 @@ The gamma correction formula (brightness^2.2) maps perceived brightness
 to the physical light output needed for correct visual perception. This
 ensures smooth, perceptually uniform transitions across the full range.
 
+Rather than evaluating brightness^2.2 on every PWM update, the curve is
+sampled once at import into a 1024-entry lookup table of 16-bit duty cycles.
+Conversions interpolate linearly between adjacent table entries, which stays
+within 1 LSB of the exact formula while replacing a float pow() call with a
+table load and a multiply - a meaningful saving on the Pico's software
+floating point.
+
 For more details, see:
 - https://codeinsecurity.wordpress.com/2023/07/17/the-problem-with-driving-leds-with-pwm/
 - https://en.wikipedia.org/wiki/Gamma_correction
@@ -35,6 +42,35 @@ try:
 except ImportError:
     config = None
 
+import array
+
+
+# Gamma lookup table resolution (entries spanning brightness 0.0-1.0)
+_LUT_SIZE = 1024
+_LUT_MAX_INDEX = _LUT_SIZE - 1
+
+
+def _build_gamma_lut(gamma: float, max_duty: int) -> array.array:
+    """Sample the gamma curve into a table of PWM duty cycles.
+
+    Args:
+        gamma: Gamma correction exponent
+        max_duty: Duty cycle for full brightness
+
+    Returns:
+        Unsigned 16-bit array where entry i is round(max_duty * (i / 1023) ** gamma)
+    """
+    lut = array.array('H')
+    for i in range(_LUT_SIZE):
+        lut.append(round(max_duty * (i / _LUT_MAX_INDEX) ** gamma))
+    return lut
+
+
+_GAMMA_LUT = _build_gamma_lut(
+    config.GAMMA_CORRECTION if config else 2.2,
+    config.MAX_DUTY_CYCLE if config else 65535
+)
+
 
 class LEDDriver:
     """Controls warm and cool LED channels with brightness state tracking.
@@ -123,6 +159,10 @@ class LEDDriver:
         The gamma value of 2.2 is the standard for most displays and LEDs,
         representing the approximate inverse of human brightness perception.
 
+        The curve is read from a precomputed lookup table with linear
+        interpolation between entries, matching the exact power function
+        to within 1 LSB.
+
         References:
         - https://codeinsecurity.wordpress.com/2023/07/17/the-problem-with-driving-leds-with-pwm/
         - https://en.wikipedia.org/wiki/Gamma_correction
@@ -138,9 +178,12 @@ class LEDDriver:
             brightness=0.5 (50% perceived) -> duty=11930 (18% PWM)
             brightness=1.0 (100% perceived) -> duty=65535 (100% PWM)
         """
-        gamma = config.GAMMA_CORRECTION if config else 2.2
-        max_duty = config.MAX_DUTY_CYCLE if config else 65535
-        return round(max_duty * (brightness ** gamma))
+        position = brightness * _LUT_MAX_INDEX
+        index = int(position)
+        if index >= _LUT_MAX_INDEX:
+            return _GAMMA_LUT[_LUT_MAX_INDEX]
+        low = _GAMMA_LUT[index]
+        return low + round((_GAMMA_LUT[index + 1] - low) * (position - index))
 
     def night_light(self, brightness: float = 0.25) -> None:
         """Set night light mode (warm only at specified brightness).
@@ -25,6 +25,10 @@ The controller uses a periodic timer (default 5 seconds) to:
 
 This non-blocking approach ensures smooth transitions and responsive
 schedule updates without blocking sleep calls.
+
+Demo mode instead runs a blocking 50ms loop. Its ticks are scheduled against
+fixed deadlines on a monotonic clock, so the time spent updating does not
+accumulate as drift between steps.
 """
 
 import time
@@ -40,6 +44,46 @@ from network_manager import NetworkManager
 from schedule_manager import ScheduleManager
 from transition_engine import TransitionEngine
 
+# Millisecond tick clock for fixed-rate loops: MicroPython's wrapping ticks_ms
+# API, or the same API over time.monotonic_ns() on desktop Python
+if hasattr(time, 'ticks_ms'):
+    _ticks_ms = time.ticks_ms  # type: ignore[reportAttributeAccessIssue] - MicroPython API
+    _ticks_add = time.ticks_add  # type: ignore[reportAttributeAccessIssue] - MicroPython API
+    _ticks_diff = time.ticks_diff  # type: ignore[reportAttributeAccessIssue] - MicroPython API
+else:
+    def _ticks_ms() -> int:
+        return time.monotonic_ns() // 1_000_000
+
+    def _ticks_add(ticks: int, delta: int) -> int:
+        return ticks + delta
+
+    def _ticks_diff(end: int, start: int) -> int:
+        return end - start
+
+
+def _sleep_until_next_tick(deadline_ms: int, period_ms: int) -> int:
+    """Sleep until deadline_ms, then return the deadline one period later.
+
+    Deadlines advance from the previous deadline rather than from when the
+    loop body finished, so update timing stays phase-locked instead of
+    drifting by the body's run time each tick. If the loop has fallen more
+    than a full period behind, it resynchronises to now instead of running
+    the missed ticks back to back.
+
+    Args:
+        deadline_ms: Tick count at which this iteration should end
+        period_ms: Loop period in milliseconds
+
+    Returns:
+        int: Deadline for the following iteration
+    """
+    remaining_ms = _ticks_diff(deadline_ms, _ticks_ms())
+    if remaining_ms > 0:
+        time.sleep(remaining_ms / 1000)
+    elif remaining_ms <= -period_ms:
+        deadline_ms = _ticks_ms()
+    return _ticks_add(deadline_ms, period_ms)
+
 
 class LampController:
     """Main controller orchestrating all lamp components.
@@ -57,40 +101,88 @@ class LampController:
         _startup_complete: Whether startup sequence completed successfully
     """
 
-    def __init__(self) -> None:
-        """Initialize all components from configuration."""
+    def __init__(
+        self,
+        led_driver: LEDDriver | None = None,
+        network: NetworkManager | None = None,
+        schedule: ScheduleManager | None = None,
+        transition: TransitionEngine | None = None
+    ) -> None:
+        """Initialize all components, building any not supplied from configuration.
+
+        Args:
+            led_driver: LED driver to use instead of constructing one
+            network: Network manager to use instead of constructing one
+            schedule: Schedule manager to use instead of constructing one
+            transition: Transition engine to use instead of constructing one
+        """
         # Initialize LED driver first for immediate night light
-        self._leds = LEDDriver(
-            warm_pin=config.WARM_LED_PIN,
-            cool_pin=config.COOL_LED_PIN,
-            pwm_freq=config.PWM_FREQUENCY
-        )
+        if led_driver is None:
+            led_driver = LEDDriver(
+                warm_pin=config.WARM_LED_PIN,
+                cool_pin=config.COOL_LED_PIN,
+                pwm_freq=config.PWM_FREQUENCY
+            )
+        self._leds = led_driver
 
         # Initialize network manager
-        self._network = NetworkManager(
-            ssid=config.WIFI_SSID,
-            password=config.WIFI_PASSWORD,
-            ntp_servers=config.NTP_SERVERS
-        )
+        if network is None:
+            network = NetworkManager(
+                ssid=config.WIFI_SSID,
+                password=config.WIFI_PASSWORD,
+                ntp_servers=config.NTP_SERVERS
+            )
+        self._network = network
 
         # Initialize schedule manager
-        self._schedule = ScheduleManager(
-            network=self._network,
-            api_url=config.SCHEDULE_API_URL,
-            api_token=config.SCHEDULE_API_TOKEN,
-            refresh_hours=config.SCHEDULE_REFRESH_HOURS
-        )
+        if schedule is None:
+            schedule = ScheduleManager(
+                network=self._network,
+                api_url=config.SCHEDULE_API_URL,
+                api_token=config.SCHEDULE_API_TOKEN,
+                refresh_hours=config.SCHEDULE_REFRESH_HOURS
+            )
+        self._schedule = schedule
 
         # Initialize transition engine
-        self._transition = TransitionEngine(
-            schedule_manager=self._schedule,
-            led_driver=self._leds
-        )
+        if transition is None:
+            transition = TransitionEngine(
+                schedule_manager=self._schedule,
+                led_driver=self._leds
+            )
+        self._transition = transition
 
         # Timer for periodic updates
         self._timer = None
         self._startup_complete = False
 
+    @classmethod
+    def _from_components(
+        cls,
+        *,
+        led: LEDDriver,
+        network: NetworkManager,
+        schedule: ScheduleManager,
+        transition: TransitionEngine
+    ) -> "LampController":
+        """Build a controller from existing components as if startup had completed.
+
+        Lets timer-driven behavior be exercised without running the startup
+        sequence or constructing any components from configuration.
+
+        Args:
+            led: LED driver instance
+            network: Network manager instance
+            schedule: Schedule manager instance
+            transition: Transition engine instance
+
+        Returns:
+            LampController with _startup_complete set
+        """
+        controller = cls(led_driver=led, network=network, schedule=schedule, transition=transition)
+        controller._startup_complete = True
+        return controller
+
     def _log(self, message: str, level: str = "INFO") -> None:
         """Log a message to console and optionally to AWS.
 
@@ -203,7 +295,8 @@ class LampController:
 
         Blocks until KeyboardInterrupt, which propagates for clean shutdown.
         """
-        update_interval_s = 0.05  # 50ms for smooth transitions
+        update_interval_ms = 50  # 50ms for smooth transitions
+        deadline_ms = _ticks_add(_ticks_ms(), update_interval_ms)
         while True:
             try:
                 if self._schedule.needs_refresh():
@@ -225,7 +318,7 @@ class LampController:
                 except Exception:
                     pass
 
-            time.sleep(update_interval_s)
+            deadline_ms = _sleep_until_next_tick(deadline_ms, update_interval_ms)
 
     def start(self) -> None:
         """Start the lamp controller.
@@ -267,7 +360,7 @@ class LampController:
         self._leds.off()
         self._log("Lamp Controller stopped", "INFO")
 
-    def run_demo(self) -> None:
+    def run_demo(self, max_iterations: int | None = None) -> None:
         """Run demo mode locally without network connectivity.
 
         This sets up the demo schedule directly and runs the normal
@@ -286,6 +379,10 @@ class LampController:
         - Night (back to start)
 
         The cycle loops continuously until interrupted.
+
+        Args:
+            max_iterations: Stop after this many updates; 0 sets up the demo
+                schedule without updating (None loops forever)
         """
         self._log("Starting demo mode (no network)", "INFO")
 
@@ -299,21 +396,30 @@ class LampController:
         self._log(f"Demo: {cycle_duration}s cycle, looping continuously", "INFO")
 
         # Run the demo loop with frequent updates for smooth transitions
-        update_interval_s = 0.05  # 50ms updates
+        update_interval_ms = 50  # 50ms updates
+        deadline_ms = _ticks_add(_ticks_ms(), update_interval_ms)
 
+        iterations = 0
         try:
-            while True:
+            # The bound is checked before each update, so max_iterations=0
+            # runs none; the wait comes between updates, never after the last
+            while max_iterations is None or iterations < max_iterations:
+                if iterations:
+                    deadline_ms = _sleep_until_next_tick(deadline_ms, update_interval_ms)
+
                 # Refresh the demo schedule periodically to keep timestamps current
                 if self._schedule.needs_refresh():
                     self._schedule._setup_demo_schedule()
 
                 # Update brightness using the normal transition engine
                 self._transition.update()
-                time.sleep(update_interval_s)
+
+                iterations += 1
 
         except KeyboardInterrupt:
             self._log("Demo mode interrupted", "INFO")
-            self._leds.off()
+
+        self._leds.off()
 
 
 def run_demo_mode() -> None:
@@ -34,6 +34,12 @@ try:
 except ImportError:
     config = None
 
+try:
+    from typing import Callable
+except ImportError:
+    # MicroPython has no typing module; annotations are not evaluated there
+    pass
+
 from network_manager import NetworkManager
 
 
@@ -58,8 +64,9 @@ class ScheduleManager:
         _api_url: URL endpoint for fetching schedules
         _api_token: Authentication token for API requests
         _refresh_hours: Hours between schedule refreshes
-        _cached_schedule: List of processed schedule entries
+        _cached_schedule: Tuple of processed schedule entries
         _last_fetch_time: Unix timestamp of last successful fetch
+        _listeners: Callbacks notified whenever the cached schedule is replaced
         _mode: Current schedule mode
     """
 
@@ -96,9 +103,11 @@ class ScheduleManager:
         self._refresh_hours = refresh_hours or self.DEFAULT_REFRESH_HOURS
 
         # Internal state
-        self._cached_schedule = None  # List of schedule entries with unix_time
+        self._cached_schedule = None  # Tuple of schedule entries with unix_time
         self._last_fetch_time = 0  # Unix timestamp of last successful fetch
+        self._listeners: list = []  # Called on every cache replacement
         self._demo_ref_ticks_ms: int = 0  # ticks_ms reference for demo elapsed time
+        self._demo_ref_monotonic_s: float = 0.0  # Desktop equivalent of the ticks reference
 
         # Use config value or fallback to class default
         default_mode = config.DEFAULT_SCHEDULE_MODE if config else self.DEFAULT_MODE
@@ -119,18 +128,23 @@ class ScheduleManager:
         except (ValueError, TypeError):
             return False
 
-    def _check_clock_drift(self, server_time: int) -> None:
+    def _check_clock_drift(self, server_time: int) -> tuple[int, bool]:
         """Check for clock drift between local RTC and server time.
 
         Logs a warning if the difference exceeds CLOCK_DRIFT_THRESHOLD (5 minutes).
 
         Args:
             server_time: Unix timestamp from server response
+
+        Returns:
+            Tuple of (absolute drift in seconds, whether a warning was logged)
         """
         local_time = int(time.time())
         drift = abs(server_time - local_time)
-        if drift > self.CLOCK_DRIFT_THRESHOLD:
+        warned = drift > self.CLOCK_DRIFT_THRESHOLD
+        if warned:
             print(f"Warning: Clock drift detected. Server={server_time}, Local={local_time}, Drift={drift}s")
+        return (drift, warned)
 
     def _process_brightness_schedule(
         self,
@@ -212,13 +226,20 @@ class ScheduleManager:
             return False
 
         try:
-            # Extract mode
+            # Extract mode. It is only stored once the new schedule is cached,
+            # so a failed fetch never leaves the mode out of step with the
+            # schedule that listeners were last given.
             default_mode = config.DEFAULT_SCHEDULE_MODE if config else self.DEFAULT_MODE
-            self._mode = response.get("mode", default_mode)
+            mode = response.get("mode", default_mode)
 
             # If demo mode, use hardcoded demo schedule from config
-            if self._mode == "demo":
-                return self._setup_demo_schedule()
+            if mode == "demo":
+                previous_mode = self._mode
+                self._mode = mode
+                if self._setup_demo_schedule():
+                    return True
+                self._mode = previous_mode
+                return False
 
             # Check clock drift using serverTime
             server_time = response.get("serverTime")
@@ -240,8 +261,10 @@ class ScheduleManager:
                 return False
 
             # Update cache
-            self._cached_schedule = processed
+            self._mode = mode
+            self._cached_schedule = tuple(processed)
             self._last_fetch_time = int(time.time())
+            self._notify_listeners()
 
             print(f"Schedule fetched: {len(processed)} entries, mode={self._mode}")
             return True
@@ -284,7 +307,7 @@ class ScheduleManager:
                 "label": label
             })
 
-        self._cached_schedule = entries
+        self._cached_schedule = tuple(entries)
         self._last_fetch_time = now
 
         # Store ticks reference for sub-second elapsed time calculation.
@@ -293,7 +316,9 @@ class ScheduleManager:
         if hasattr(time, 'ticks_ms'):
             self._demo_ref_ticks_ms = time.ticks_ms()  # type: ignore[reportAttributeAccessIssue] - MicroPython API
         else:
-            self._demo_ref_ticks_ms = 0
+            self._demo_ref_monotonic_s = time.monotonic()
+
+        self._notify_listeners()
 
         print(f"Demo schedule set up: {len(entries)} entries, {cycle_duration}s cycle")
         return True
@@ -305,8 +330,9 @@ class ScheduleManager:
         time.time() returns integer seconds on MicroPython which causes
         visible brightness stepping in fast demo transitions.
 
-        Falls back to float time.time() on CPython where it already
-        has microsecond precision.
+        Falls back to time.monotonic() on CPython. Both clocks are
+        immune to wall-clock steps from NTP, so a time sync during the demo
+        does not make the cycle jump.
 
         Returns:
             Elapsed seconds since demo schedule setup, as a float.
@@ -315,9 +341,8 @@ class ScheduleManager:
             # type: ignore below - MicroPython-only API, guarded by hasattr
             elapsed_ms = time.ticks_diff(time.ticks_ms(), self._demo_ref_ticks_ms)  # type: ignore[reportAttributeAccessIssue]
             return elapsed_ms / 1000.0
-        # CPython: time.time() returns float with sub-second precision
         if self._cached_schedule:
-            return time.time() - self._cached_schedule[0]["unix_time"]
+            return time.monotonic() - self._demo_ref_monotonic_s
         return 0.0
 
     def is_demo_mode(self) -> bool:
@@ -368,17 +393,41 @@ class ScheduleManager:
 
         return False
 
-    def get_entries(self) -> list[dict]:
+    def get_entries(self) -> tuple:
         """Return cached schedule entries sorted by time.
 
+        The same tuple is returned until the schedule is replaced, so callers
+        can detect changes by identity.
+
         Returns:
-            List of schedule entry dicts with 'unix_time', 'warm', 'cool', 'label',
-            or empty list if no schedule cached.
+            Tuple of schedule entry dicts with 'unix_time', 'warm', 'cool', 'label',
+            or empty tuple if no schedule cached.
         """
         if self._cached_schedule is None:
-            return []
+            return ()
         return self._cached_schedule
 
+    def add_listener(self, callback: Callable[[tuple, bool, float], None]) -> None:
+        """Register a callback for schedule changes.
+
+        The callback is called as callback(entries, is_demo, cycle_duration)
+        each time the cached schedule is replaced, so consumers such as
+        TransitionEngine can rebuild derived data once instead of re-reading
+        the schedule on every update.
+
+        Args:
+            callback: Function taking (entries, is_demo, cycle_duration)
+        """
+        self._listeners.append(callback)
+
+    def _notify_listeners(self) -> None:
+        """Pass the current schedule to every registered listener."""
+        entries = self.get_entries()
+        is_demo = self.is_demo_mode()
+        cycle_duration = self.get_demo_cycle_duration()
+        for callback in self._listeners:
+            callback(entries, is_demo, cycle_duration)
+
     def get_mode(self) -> str:
         """Return current schedule mode.
 
@@ -0,0 +1,143 @@
+"""Shared pytest fixtures for Sunrise Lamp Controller tests."""
+
+# pyright: reportPrivateUsage=false
+
+from collections.abc import Callable, Iterator
+from typing import Any
+from unittest.mock import create_autospec
+import importlib
+import os
+import sys
+import time
+
+import pytest
+from hypothesis import HealthCheck, settings
+from hypothesis.database import DirectoryBasedExampleDatabase
+
+# Install the machine stub before any test module imports the lamp modules
+sys.modules.setdefault('machine', importlib.import_module('tests.mocks.machine'))
+
+# Hypothesis profiles: "dev" for local runs, "ci" for fast, reproducible CI runs.
+# Select with HYP_PROFILE=ci; explicit @settings on a test still take precedence.
+# dev saves failing examples to a tracked directory (not the ignored .hypothesis/)
+# so they replay first on every checkout. ci is derandomized, which Hypothesis
+# only allows without a database; pin regressions there with @example.
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'hypothesis-examples')
+settings.register_profile(
+    "dev",
+    max_examples=100,
+    database=DirectoryBasedExampleDatabase(EXAMPLES_DIR),
+)
+settings.register_profile(
+    "ci",
+    max_examples=25,
+    deadline=None,
+    derandomize=True,
+    suppress_health_check=[HealthCheck.too_slow],
+)
+settings.load_profile(os.getenv("HYP_PROFILE", "dev"))
+
+from tests.mocks import FakeClock, MockLEDDriver, MockNetworkManager, MockScheduleManager  # noqa: E402
+
+
+# One fake clock replaces time.time() for every module under test; tests move it
+# with set_time() instead of re-patching. Both fixtures start at FROZEN_TIME.
+
+@pytest.fixture
+def frozen_time(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Freeze time.time() for a single test."""
+    fake = FakeClock()
+    monkeypatch.setattr(time, 'time', fake)
+    return fake
+
+
+@pytest.fixture(scope='class')
+def clock() -> Iterator[FakeClock]:
+    """Freeze time.time() for a whole test class (usable with @given)."""
+    fake = FakeClock()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(time, 'time', fake)
+        yield fake
+
+
+@pytest.fixture(scope='session')
+def led() -> Any:
+    """Single real LEDDriver on the stub PWM, shared by the whole session.
+
+    Tests that assert on its state should request led_reset as well.
+    """
+    from led_driver import LEDDriver
+    return LEDDriver(warm_pin=10, cool_pin=20)
+
+
+@pytest.fixture
+def led_reset(led: Any) -> Any:
+    """The shared LEDDriver, switched off before the test runs."""
+    led.set_brightness(0.0, 0.0)
+    return led
+
+
+# Component doubles are function-scoped: each one records calls and state,
+# so sharing them across tests would leak results between tests.
+
+@pytest.fixture
+def mock_led() -> MockLEDDriver:
+    """Fresh MockLEDDriver with all channels off."""
+    return MockLEDDriver(10, 20)
+
+
+@pytest.fixture
+def mock_network() -> MockNetworkManager:
+    """Fresh, disconnected MockNetworkManager whose WiFi and NTP succeed."""
+    return MockNetworkManager("test", "pass")
+
+
+@pytest.fixture
+def mock_schedule(mock_network: MockNetworkManager) -> MockScheduleManager:
+    """Fresh MockScheduleManager without a cached schedule."""
+    return MockScheduleManager(mock_network, "url", "token")
+
+
+@pytest.fixture
+def mock_transition() -> Any:
+    """Autospecced TransitionEngine instance."""
+    from transition_engine import TransitionEngine
+    return create_autospec(TransitionEngine, instance=True, spec_set=True)
+
+
+@pytest.fixture
+def controller_factory(
+    mock_led: MockLEDDriver,
+    mock_network: MockNetworkManager,
+    mock_schedule: MockScheduleManager,
+    mock_transition: Any,
+) -> Callable[..., tuple[Any, dict[str, Any]]]:
+    """Build a LampController wired to this test's component doubles.
+
+    Returns:
+        make(wifi_ok=True, ntp_ok=True, sched_ok=True) returning the controller
+        and a dict of its mocks keyed 'led', 'network', 'schedule', 'transition'
+    """
+    from main import LampController
+
+    def make(
+        wifi_ok: bool = True, ntp_ok: bool = True, sched_ok: bool = True
+    ) -> tuple[Any, dict[str, Any]]:
+        mock_network.wifi_should_succeed = wifi_ok
+        mock_network.ntp_should_succeed = ntp_ok
+        mock_schedule.fetch_should_succeed = sched_ok
+        controller = LampController(
+            led_driver=mock_led,
+            network=mock_network,
+            schedule=mock_schedule,
+            transition=mock_transition
+        )
+        mocks = {
+            'led': mock_led,
+            'network': mock_network,
+            'schedule': mock_schedule,
+            'transition': mock_transition,
+        }
+        return controller, mocks
+
+    return make
@@ -0,0 +1,166 @@
+"""Lightweight test doubles for the Sunrise Lamp Controller tests.
+
+Shared by the test modules and the fixtures in conftest.py. The TransitionEngine
+double is built with create_autospec(TransitionEngine) instead of a class here.
+"""
+
+# pyright: reportPrivateUsage=false
+
+import array
+from typing import Any
+from unittest.mock import MagicMock
+
+__all__ = ['FROZEN_TIME', 'FakeClock', 'MockLEDDriver', 'MockNetworkManager', 'MockScheduleManager']
+
+# 2025-01-01 00:00:00 UTC, the starting point of the frozen test clock
+FROZEN_TIME = 1735689600
+
+
+class MockLEDDriver:
+    """Mock LED driver for testing."""
+
+    __slots__ = ('_warm_brightness', '_cool_brightness', 'night_light', '_warm_hist', '_cool_hist')
+
+    def __init__(self, warm_pin: int, cool_pin: int, pwm_freq: int = 8000) -> None:
+        self._warm_brightness: float = 0.0
+        self._cool_brightness: float = 0.0
+        self.night_light = MagicMock(side_effect=self._real_night_light)
+        # History buffers are allocated on the first set_brightness call
+        self._warm_hist: array.array[float] | None = None
+        self._cool_hist: array.array[float] | None = None
+
+    @property
+    def set_brightness_calls(self) -> list[tuple[float, float]]:
+        if self._warm_hist is None or self._cool_hist is None:
+            return []
+        return list(zip(self._warm_hist, self._cool_hist))
+
+    def set_brightness(self, warm: float, cool: float) -> None:
+        self._warm_brightness = warm
+        self._cool_brightness = cool
+        if self._warm_hist is None or self._cool_hist is None:
+            self._warm_hist = array.array('d')
+            self._cool_hist = array.array('d')
+        self._warm_hist.append(warm)
+        self._cool_hist.append(cool)
+
+    def get_brightness(self) -> tuple[float, float]:
+        return (self._warm_brightness, self._cool_brightness)
+
+    def _real_night_light(self, brightness: float = 0.25) -> None:
+        self._warm_brightness = brightness
+        self._cool_brightness = 0.0
+
+    def off(self) -> None:
+        self._warm_brightness = 0.0
+        self._cool_brightness = 0.0
+
+
+class MockNetworkManager:
+    """Mock network manager for testing."""
+
+    __slots__ = (
+        'ssid', 'password', 'ntp_servers', '_connected', '_time_synced',
+        'wifi_should_succeed', 'ntp_should_succeed',
+    )
+
+    def __init__(self, ssid: str, password: str, ntp_servers: list[str] | None = None) -> None:
+        self.ssid: str = ssid
+        self.password: str = password
+        self.ntp_servers: list[str] | None = ntp_servers
+        self._connected: bool = False
+        self._time_synced: bool = False
+
+        # Control test behavior
+        self.wifi_should_succeed: bool = True
+        self.ntp_should_succeed: bool = True
+
+    def connect_wifi(self, timeout: int = 30) -> bool:
+        if self.wifi_should_succeed:
+            self._connected = True
+            return True
+        return False
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def ensure_connected(self, timeout: int = 30) -> bool:
+        return self._connected
+
+    def sync_time(self) -> bool:
+        if self.ntp_should_succeed:
+            self._time_synced = True
+            return True
+        return False
+
+    def is_time_synced(self) -> bool:
+        return self._time_synced
+
+    def http_get(self, url: str, headers: dict[str, str] | None = None, timeout: int = 10) -> None:
+        return None
+
+    def http_post(self, url: str, data: Any, headers: dict[str, str] | None = None, timeout: int = 10) -> bool:
+        return True
+
+
+class MockScheduleManager:
+    """Mock schedule manager for testing."""
+
+    __slots__ = ('network', 'api_url', 'api_token', '_mode', '_has_schedule', 'fetch_should_succeed')
+
+    def __init__(self, network: MockNetworkManager, api_url: str, api_token: str, refresh_hours: int | None = None) -> None:
+        self.network: MockNetworkManager = network
+        self.api_url: str = api_url
+        self.api_token: str = api_token
+        self._mode: str = "dayNight"
+        self._has_schedule: bool = False
+
+        # Control test behavior
+        self.fetch_should_succeed: bool = True
+
+    def fetch_schedule(self) -> bool:
+        if self.fetch_should_succeed:
+            self._has_schedule = True
+            return True
+        return False
+
+    def needs_refresh(self) -> bool:
+        return not self._has_schedule
+
+    def get_entries(self) -> tuple[dict[str, Any], ...]:
+        return ()
+
+    def add_listener(self, callback: Any) -> None:
+        pass
+
+    def get_mode(self) -> str:
+        return self._mode
+
+    def has_valid_schedule(self) -> bool:
+        return self._has_schedule
+
+    def is_demo_mode(self) -> bool:
+        return self._mode == "demo"
+
+    def get_demo_cycle_duration(self) -> int:
+        return 15
+
+    def _setup_demo_schedule(self) -> bool:
+        self._mode = "demo"
+        self._has_schedule = True
+        return True
+
+
+class FakeClock:
+    """Callable standing in for time.time(), moved with set_time()."""
+
+    __slots__ = ('now',)
+
+    def __init__(self, now: float = FROZEN_TIME) -> None:
+        self.now: float = float(now)
+
+    def __call__(self) -> float:
+        return self.now
+
+    def set_time(self, t: float) -> None:
+        self.now = float(t)
@@ -0,0 +1,42 @@
+"""Stand-in for MicroPython's machine module on desktop Python.
+
+Provides just the classes the lamp modules use, as plain no-op classes.
+"""
+
+from typing import Any
+
+
+class Pin:
+    """GPIO pin stub."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+class PWM:
+    """PWM channel stub that records the last duty cycle written."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._duty = 0
+
+    def freq(self, *args: Any) -> None:
+        pass
+
+    def duty_u16(self, value: int) -> None:
+        self._duty = value
+
+
+class Timer:
+    """Hardware timer stub."""
+
+    PERIODIC = 1
+    ONE_SHOT = 0
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def init(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def deinit(self) -> None:
+        pass
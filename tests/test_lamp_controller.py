@@ -7,404 +7,244 @@ Tests verify:
 
 # pyright: reportPrivateUsage=false
 
+from collections.abc import Callable
 from typing import Any
-from unittest.mock import patch, MagicMock
-import sys
+from unittest.mock import call, create_autospec, patch, Mock
 
-# Mock the machine module before importing main
-sys.modules['machine'] = MagicMock()
+import time
 
-import config  # noqa: E402
-from main import LampController  # noqa: E402
+import pytest
 
+import config
+from main import LampController, _sleep_until_next_tick
+from tests.mocks import MockLEDDriver, MockNetworkManager, MockScheduleManager
+from transition_engine import TransitionEngine
 
-class MockLEDDriver:
-    """Mock LED driver for testing."""
 
-    def __init__(self, warm_pin: int, cool_pin: int, pwm_freq: int = 8000) -> None:
-        self._warm_brightness: float = 0.0
-        self._cool_brightness: float = 0.0
-        self.night_light_called: bool = False
-        self.night_light_brightness: float | None = None
-        self.set_brightness_calls: list[tuple[float, float]] = []
-
-    def set_brightness(self, warm: float, cool: float) -> None:
-        self._warm_brightness = warm
-        self._cool_brightness = cool
-        self.set_brightness_calls.append((warm, cool))
-
-    def get_brightness(self) -> tuple[float, float]:
-        return (self._warm_brightness, self._cool_brightness)
-
-    def night_light(self, brightness: float = 0.25) -> None:
-        self.night_light_called = True
-        self.night_light_brightness = brightness
-        self._warm_brightness = brightness
-        self._cool_brightness = 0.0
-
-    def off(self) -> None:
-        self._warm_brightness = 0.0
-        self._cool_brightness = 0.0
-
-
-class MockNetworkManager:
-    """Mock network manager for testing."""
-
-    def __init__(self, ssid: str, password: str, ntp_servers: list[str] | None = None) -> None:
-        self.ssid: str = ssid
-        self.password: str = password
-        self.ntp_servers: list[str] | None = ntp_servers
-        self._connected: bool = False
-        self._time_synced: bool = False
-
-        # Control test behavior
-        self.wifi_should_succeed: bool = True
-        self.ntp_should_succeed: bool = True
-
-    def connect_wifi(self, timeout: int = 30) -> bool:
-        if self.wifi_should_succeed:
-            self._connected = True
-            return True
-        return False
-
-    def is_connected(self) -> bool:
-        return self._connected
-
-    def ensure_connected(self, timeout: int = 30) -> bool:
-        return self._connected
-
-    def sync_time(self) -> bool:
-        if self.ntp_should_succeed:
-            self._time_synced = True
-            return True
-        return False
-
-    def is_time_synced(self) -> bool:
-        return self._time_synced
-
-    def http_get(self, url: str, headers: dict[str, str] | None = None, timeout: int = 10) -> None:
-        return None
-
-    def http_post(self, url: str, data: Any, headers: dict[str, str] | None = None, timeout: int = 10) -> bool:
-        return True
-
-
-class MockScheduleManager:
-    """Mock schedule manager for testing."""
-
-    def __init__(self, network: MockNetworkManager, api_url: str, api_token: str, refresh_hours: int | None = None) -> None:
-        self.network: MockNetworkManager = network
-        self.api_url: str = api_url
-        self.api_token: str = api_token
-        self._mode: str = "dayNight"
-        self._has_schedule: bool = False
-
-        # Control test behavior
-        self.fetch_should_succeed: bool = True
-
-    def fetch_schedule(self) -> bool:
-        if self.fetch_should_succeed:
-            self._has_schedule = True
-            return True
-        return False
-
-    def needs_refresh(self) -> bool:
-        return not self._has_schedule
-
-    def get_entries(self) -> list[dict[str, Any]]:
-        return []
-
-    def get_mode(self) -> str:
-        return self._mode
-
-    def has_valid_schedule(self) -> bool:
-        return self._has_schedule
-
-    def is_demo_mode(self) -> bool:
-        return self._mode == "demo"
-
-    def get_demo_cycle_duration(self) -> int:
-        return 15
-
-    def _setup_demo_schedule(self) -> bool:
-        self._mode = "demo"
-        self._has_schedule = True
-        return True
-
-
-class MockTransitionEngine:
-    """Mock transition engine for testing."""
-
-    def __init__(self, schedule_manager: MockScheduleManager, led_driver: MockLEDDriver) -> None:
-        self.schedule: MockScheduleManager = schedule_manager
-        self.leds: MockLEDDriver = led_driver
-        self.update_called: bool = False
-
-    def update(self) -> None:
-        self.update_called = True
-
-    def get_current_target(self) -> tuple[float, float]:
-        return (0.25, 0.0)
+def _always_raises(*args: Any, **kwargs: Any) -> None:
+    """Stand-in for a failing TransitionEngine.update."""
+    raise RuntimeError("Test error")
 
 
 class TestStartupSequence:
     """Tests for LampController startup sequence."""
 
-    def test_night_light_set_before_network_operations(self) -> None:
+    def test_night_light_set_before_network_operations(
+        self, controller_factory: Callable[..., tuple[LampController, dict[str, Any]]]
+    ) -> None:
         """Verify night light is set immediately before any network operations.
 
         Requirements: 3.1 - WHEN the device powers on, THE Lamp_Controller SHALL
         immediately set LEDs to night light mode before attempting network operations
         """
-        # Track the order of operations
-        operation_order: list[str] = []
-
-        mock_led = MockLEDDriver(10, 20)
-        original_night_light = mock_led.night_light
-        def tracked_night_light(brightness: float = 0.25) -> None:
-            operation_order.append('night_light')
-            original_night_light(brightness)
-        mock_led.night_light = tracked_night_light  # type: ignore[assignment]
-
-        mock_network = MockNetworkManager("test", "pass")
-        original_connect = mock_network.connect_wifi
-        def tracked_connect(timeout: int = 30) -> bool:
-            operation_order.append('wifi_connect')
-            return original_connect(timeout)
-        mock_network.connect_wifi = tracked_connect  # type: ignore[assignment]
-
-        mock_schedule = MockScheduleManager(mock_network, "url", "token")
-        mock_transition = MockTransitionEngine(mock_schedule, mock_led)
-
-        # Create controller with mocked components
-        with patch('main.LEDDriver', return_value=mock_led), \
-             patch('main.NetworkManager', return_value=mock_network), \
-             patch('main.ScheduleManager', return_value=mock_schedule), \
-             patch('main.TransitionEngine', return_value=mock_transition):
-
-            controller = LampController()
-
+        controller, mocks = controller_factory()
+
+        # Record call order on a single parent mock. The mocks use __slots__, so
+        # connect_wifi is spied on the class; side_effect keeps real behavior.
+        parent = Mock()
+        parent.attach_mock(mocks['led'].night_light, 'night_light')
+        with patch.object(
+            MockNetworkManager, 'connect_wifi', autospec=True,
+            side_effect=MockNetworkManager.connect_wifi
+        ) as connect_wifi:
+            parent.attach_mock(connect_wifi, 'wifi_connect')
             controller._startup_sequence()
 
         # Verify night_light was called before wifi_connect
-        assert 'night_light' in operation_order
-        assert 'wifi_connect' in operation_order
-        night_light_index = operation_order.index('night_light')
-        wifi_index = operation_order.index('wifi_connect')
-        assert night_light_index < wifi_index, \
-            f"Night light should be set before WiFi connect. Order: {operation_order}"
-
-    def test_fallback_on_wifi_failure(self) -> None:
-        """Verify lamp stays in night light mode when WiFi fails.
-
-        Requirements: 3.2 - WHEN WiFi connection fails after 30 seconds,
-        THE Lamp_Controller SHALL continue in night light mode
-        """
-        mock_led = MockLEDDriver(10, 20)
-        mock_network = MockNetworkManager("test", "pass")
-        mock_network.wifi_should_succeed = False
-
-        mock_schedule = MockScheduleManager(mock_network, "url", "token")
-        mock_transition = MockTransitionEngine(mock_schedule, mock_led)
-
-        with patch('main.LEDDriver', return_value=mock_led), \
-             patch('main.NetworkManager', return_value=mock_network), \
-             patch('main.ScheduleManager', return_value=mock_schedule), \
-             patch('main.TransitionEngine', return_value=mock_transition):
-
-            controller = LampController()
-
-            result = controller._startup_sequence()
-
-        # Startup should fail but night light should be active
-        assert result is False
-        assert mock_led.night_light_called
-        assert mock_led.night_light_brightness == config.NIGHT_LIGHT_BRIGHTNESS
-
-    def test_fallback_on_ntp_failure(self) -> None:
-        """Verify lamp stays in night light mode when NTP sync fails.
-
-        Requirements: 3.4 - WHEN NTP sync fails on startup, THE Lamp_Controller
-        SHALL remain in night light mode since schedule times cannot be evaluated
+        night_light = call.night_light(config.NIGHT_LIGHT_BRIGHTNESS)
+        wifi_connect = call.wifi_connect(mocks['network'], timeout=config.WIFI_TIMEOUT_S)
+        assert night_light in parent.mock_calls
+        assert wifi_connect in parent.mock_calls
+        assert parent.mock_calls.index(night_light) < parent.mock_calls.index(wifi_connect), \
+            f"Night light should be set before WiFi connect. Calls: {parent.mock_calls}"
+
+    @pytest.mark.parametrize(
+        "wifi_ok, ntp_ok, sched_ok, expect",
+        [
+            pytest.param(False, True, True, False, id="wifi_failure"),
+            pytest.param(True, False, True, False, id="ntp_failure"),
+            pytest.param(True, True, False, False, id="schedule_failure"),
+            pytest.param(True, True, True, True, id="success"),
+        ],
+    )
+    def test_startup_sequence_outcome(
+        self,
+        controller_factory: Callable[..., tuple[LampController, dict[str, Any]]],
+        wifi_ok: bool,
+        ntp_ok: bool,
+        sched_ok: bool,
+        expect: bool,
+    ) -> None:
+        """Verify startup result and night light fallback for each phase outcome.
+
+        Requirements:
+        - 3.2 - WHEN WiFi connection fails after 30 seconds, THE Lamp_Controller
+          SHALL continue in night light mode
+        - 3.3 - WHEN schedule fetch fails on startup, THE Lamp_Controller SHALL
+          operate in night light mode until a schedule is successfully retrieved
+        - 3.4 - WHEN NTP sync fails on startup, THE Lamp_Controller SHALL remain
+          in night light mode since schedule times cannot be evaluated
         """
-        mock_led = MockLEDDriver(10, 20)
-        mock_network = MockNetworkManager("test", "pass")
-        mock_network.wifi_should_succeed = True
-        mock_network.ntp_should_succeed = False
-
-        mock_schedule = MockScheduleManager(mock_network, "url", "token")
-        mock_transition = MockTransitionEngine(mock_schedule, mock_led)
-
-        with patch('main.LEDDriver', return_value=mock_led), \
-             patch('main.NetworkManager', return_value=mock_network), \
-             patch('main.ScheduleManager', return_value=mock_schedule), \
-             patch('main.TransitionEngine', return_value=mock_transition):
-
-            controller = LampController()
-
-            result = controller._startup_sequence()
-
-        # Startup should fail but night light should be active
-        assert result is False
-        assert mock_led.night_light_called
-        # Schedule fetch should not have been attempted
-        assert not mock_schedule._has_schedule
-
-    def test_fallback_on_schedule_failure(self) -> None:
-        """Verify lamp stays in night light mode when schedule fetch fails.
-
-        Requirements: 3.3 - WHEN schedule fetch fails on startup, THE Lamp_Controller
-        SHALL operate in night light mode until a schedule is successfully retrieved
-        """
-        mock_led = MockLEDDriver(10, 20)
-        mock_network = MockNetworkManager("test", "pass")
-        mock_network.wifi_should_succeed = True
-        mock_network.ntp_should_succeed = True
-
-        mock_schedule = MockScheduleManager(mock_network, "url", "token")
-        mock_schedule.fetch_should_succeed = False
-
-        mock_transition = MockTransitionEngine(mock_schedule, mock_led)
-
-        with patch('main.LEDDriver', return_value=mock_led), \
-             patch('main.NetworkManager', return_value=mock_network), \
-             patch('main.ScheduleManager', return_value=mock_schedule), \
-             patch('main.TransitionEngine', return_value=mock_transition):
-
-            controller = LampController()
-
-            result = controller._startup_sequence()
-
-        # Startup should fail but night light should be active
-        assert result is False
-        assert mock_led.night_light_called
-
-    def test_successful_startup_sequence(self) -> None:
-        """Verify complete startup sequence when all operations succeed."""
-        mock_led = MockLEDDriver(10, 20)
-        mock_network = MockNetworkManager("test", "pass")
-        mock_schedule = MockScheduleManager(mock_network, "url", "token")
-        mock_transition = MockTransitionEngine(mock_schedule, mock_led)
+        controller, mocks = controller_factory(wifi_ok=wifi_ok, ntp_ok=ntp_ok, sched_ok=sched_ok)
 
-        with patch('main.LEDDriver', return_value=mock_led), \
-             patch('main.NetworkManager', return_value=mock_network), \
-             patch('main.ScheduleManager', return_value=mock_schedule), \
-             patch('main.TransitionEngine', return_value=mock_transition):
+        result = controller._startup_sequence()
 
-            controller = LampController()
-
-            result = controller._startup_sequence()
-
-        # All phases should complete successfully
-        assert result is True
-        assert mock_led.night_light_called
-        assert mock_network._connected
-        assert mock_network._time_synced
-        assert mock_schedule._has_schedule
-        assert mock_transition.update_called
-        assert controller._startup_complete
+        assert result is expect
+        # Night light is always set first, and stays active if any phase fails
+        mocks['led'].night_light.assert_called_with(config.NIGHT_LIGHT_BRIGHTNESS)
+        # Each phase only runs once the previous one succeeded
+        assert mocks['network']._connected is wifi_ok
+        assert mocks['network']._time_synced is (wifi_ok and ntp_ok)
+        assert mocks['schedule']._has_schedule is expect
+        assert mocks['transition'].update.called is expect
+        assert controller._startup_complete is expect
 
 
 class TestDemoMode:
     """Tests for demo mode functionality."""
 
-    def test_demo_mode_interpolates_brightness(self) -> None:
+    def test_demo_mode_interpolates_brightness(
+        self, controller_factory: Callable[..., tuple[LampController, dict[str, Any]]]
+    ) -> None:
         """Verify demo mode calculates correct brightness interpolation."""
-        mock_led = MockLEDDriver(10, 20)
-        mock_network = MockNetworkManager("test", "pass")
-        mock_schedule = MockScheduleManager(mock_network, "url", "token")
-        mock_transition = MockTransitionEngine(mock_schedule, mock_led)
+        controller, mocks = controller_factory()
+
+        # A single update exits the loop without sleeping
+        controller.run_demo(max_iterations=1)
 
-        with patch('main.LEDDriver', return_value=mock_led), \
-             patch('main.NetworkManager', return_value=mock_network), \
-             patch('main.ScheduleManager', return_value=mock_schedule), \
-             patch('main.TransitionEngine', return_value=mock_transition), \
-             patch('main.time.sleep', side_effect=KeyboardInterrupt):
+        assert mocks['transition'].update.call_count == 1
+        # Verify LED was set to off when the demo stopped
+        assert mocks['led']._warm_brightness == 0.0
+        assert mocks['led']._cool_brightness == 0.0
 
-            controller = LampController()
+    @pytest.mark.parametrize('max_iterations', [0, 3])
+    def test_demo_runs_exactly_max_iterations(
+        self,
+        controller_factory: Callable[..., tuple[LampController, dict[str, Any]]],
+        monkeypatch: pytest.MonkeyPatch,
+        max_iterations: int,
+    ) -> None:
+        """run_demo performs exactly max_iterations updates, including none."""
+        controller, mocks = controller_factory()
+        monkeypatch.setattr(time, 'sleep', lambda seconds: None)
 
-            # Run demo (will be interrupted immediately by mocked sleep)
-            try:
-                controller.run_demo()
-            except KeyboardInterrupt:
-                pass
+        controller.run_demo(max_iterations=max_iterations)
 
-        # Verify LED was set to off after interrupt
-        assert mock_led._warm_brightness == 0.0
-        assert mock_led._cool_brightness == 0.0
+        assert mocks['transition'].update.call_count == max_iterations
 
     def test_demo_schedule_is_configured(self) -> None:
         """Verify demo schedule is properly configured."""
-        import config
-
         assert hasattr(config, 'DEMO_SCHEDULE')
         assert hasattr(config, 'DEMO_CYCLE_DURATION_S')
         assert len(config.DEMO_SCHEDULE) >= 2  # At least 2 waypoints
         assert config.DEMO_CYCLE_DURATION_S > 0
 
-        # Verify each waypoint has correct format
-        for waypoint in config.DEMO_SCHEDULE:
-            assert len(waypoint) == 4  # (time, warm, cool, label)
-            assert isinstance(waypoint[0], (int, float))  # time
-            assert 0 <= waypoint[1] <= 100  # warm brightness
-            assert 0 <= waypoint[2] <= 100  # cool brightness
-            assert isinstance(waypoint[3], str)  # label
+    @pytest.mark.parametrize('idx', range(len(config.DEMO_SCHEDULE)))
+    def test_waypoint_format(self, idx: int) -> None:
+        """Verify each demo waypoint has correct format."""
+        waypoint = config.DEMO_SCHEDULE[idx]
+
+        assert len(waypoint) == 4  # (time, warm, cool, label)
+        assert isinstance(waypoint[0], (int, float))  # time
+        assert 0 <= waypoint[1] <= 100  # warm brightness
+        assert 0 <= waypoint[2] <= 100  # cool brightness
+        assert isinstance(waypoint[3], str)  # label
+
+
+@pytest.fixture(scope='module')
+def happy_controller() -> LampController:
+    """LampController with a connected network and a cached schedule.
+
+    Built once per module; tests must reset any mock state they assert on.
+    """
+    mock_led = MockLEDDriver(10, 20)
+    mock_network = MockNetworkManager("test", "pass")
+    mock_network._connected = True
+
+    mock_schedule = MockScheduleManager(mock_network, "url", "token")
+    mock_schedule._has_schedule = True
+
+    mock_transition = create_autospec(TransitionEngine, instance=True, spec_set=True)
+
+    return LampController._from_components(
+        led=mock_led,
+        network=mock_network,
+        schedule=mock_schedule,
+        transition=mock_transition
+    )
 
 
 class TestTimerCallback:
     """Tests for timer callback behavior."""
 
-    def test_timer_callback_updates_brightness(self) -> None:
+    def test_timer_callback_updates_brightness(self, happy_controller: LampController) -> None:
         """Verify timer callback updates LED brightness."""
-        mock_led = MockLEDDriver(10, 20)
-        mock_network = MockNetworkManager("test", "pass")
-        mock_network._connected = True
+        mock_transition = happy_controller._transition
 
-        mock_schedule = MockScheduleManager(mock_network, "url", "token")
-        mock_schedule._has_schedule = True
+        # Reset update call tracking to test timer callback
+        mock_transition.update.reset_mock()
 
-        mock_transition = MockTransitionEngine(mock_schedule, mock_led)
+        happy_controller._on_timer(None)
 
-        with patch('main.LEDDriver', return_value=mock_led), \
-             patch('main.NetworkManager', return_value=mock_network), \
-             patch('main.ScheduleManager', return_value=mock_schedule), \
-             patch('main.TransitionEngine', return_value=mock_transition):
+        assert mock_transition.update.called
 
-            controller = LampController()
+    def test_timer_callback_falls_back_on_error(self, happy_controller: LampController) -> None:
+        """Verify timer callback falls back to night light on error."""
+        mock_led = happy_controller._leds
 
-            # Reset update_called to test timer callback
-            mock_transition.update_called = False
+        # Reset night_light call tracking
+        mock_led.night_light.reset_mock()
 
-            controller._on_timer(None)
+        # Transition engine update raises an error
+        with patch.object(happy_controller._transition, 'update', side_effect=_always_raises):
+            # Should not raise, should fall back to night light
+            happy_controller._on_timer(None)
 
-        assert mock_transition.update_called
+        assert mock_led.night_light.called
 
-    def test_timer_callback_falls_back_on_error(self) -> None:
-        """Verify timer callback falls back to night light on error."""
-        mock_led = MockLEDDriver(10, 20)
-        mock_network = MockNetworkManager("test", "pass")
-        mock_network._connected = True
 
-        mock_schedule = MockScheduleManager(mock_network, "url", "token")
-        mock_schedule._has_schedule = True
+class TestTickScheduling:
+    """Tests for the fixed-rate demo loop timing."""
 
-        # Create transition engine that raises an error
-        mock_transition = MockTransitionEngine(mock_schedule, mock_led)
-        def raise_error() -> None:
-            raise RuntimeError("Test error")
-        mock_transition.update = raise_error  # type: ignore[assignment]
+    def test_deadlines_do_not_drift_with_work_time(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Sleeps shrink by the loop body's run time so ticks stay 50ms apart."""
+        now_ms = [100_000]
+        sleeps: list[float] = []
 
-        with patch('main.LEDDriver', return_value=mock_led), \
-             patch('main.NetworkManager', return_value=mock_network), \
-             patch('main.ScheduleManager', return_value=mock_schedule), \
-             patch('main.TransitionEngine', return_value=mock_transition):
+        def fake_sleep(seconds: float) -> None:
+            sleeps.append(seconds)
+            now_ms[0] += round(seconds * 1000)
 
-            controller = LampController()
+        monkeypatch.setattr(time, 'monotonic_ns', lambda: now_ms[0] * 1_000_000)
+        monkeypatch.setattr(time, 'sleep', fake_sleep)
 
-            # Reset night_light_called
-            mock_led.night_light_called = False
+        deadline = 100_050
+        for _ in range(5):
+            now_ms[0] += 20  # 20ms of update work
+            deadline = _sleep_until_next_tick(deadline, 50)
 
-            # Should not raise, should fall back to night light
-            controller._on_timer(None)
+        assert sleeps == pytest.approx([0.03] * 5)
+        assert deadline == 100_300
+
+    @pytest.mark.parametrize(
+        "now_ms, expected",
+        [
+            pytest.param(100_070, 100_100, id="late_within_period_keeps_phase"),
+            pytest.param(101_000, 101_050, id="overrun_resynchronises_to_now"),
+        ],
+    )
+    def test_late_tick_does_not_sleep(
+        self, monkeypatch: pytest.MonkeyPatch, now_ms: int, expected: int
+    ) -> None:
+        """A late tick never sleeps; it keeps phase unless a full period behind.
+
+        Being less than a period late advances from the old deadline, so the
+        next tick catches up; a larger overrun restarts from now instead of
+        bursting through the missed ticks.
+        """
+        sleeps: list[float] = []
+        monkeypatch.setattr(time, 'monotonic_ns', lambda: now_ms * 1_000_000)
+        monkeypatch.setattr(time, 'sleep', sleeps.append)
 
-        assert mock_led.night_light_called
+        assert _sleep_until_next_tick(100_050, 50) == expected
+        assert sleeps == []
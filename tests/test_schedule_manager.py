@@ -4,35 +4,61 @@ Tests the unified brightnessSchedule format processing, clock drift detection,
 and schedule fetching functionality.
 """
 
-from hypothesis import given, settings, strategies as st
-from unittest.mock import Mock, patch
+import pytest
+from hypothesis import given, strategies as st
+from unittest.mock import patch
 import time
 
 from schedule_manager import ScheduleManager
+from tests.mocks import FROZEN_TIME
+
+
+class _StubNetwork:
+    """Minimal NetworkManager stand-in whose http_get returns a fixed response."""
+
+    __slots__ = ('response',)
+
+    def __init__(self, response):
+        self.response = response
+
+    def http_get(self, *args, **kwargs):
+        return self.response
 
 
 def create_mock_network(response=None):
-    """Create a mock NetworkManager with specified response.
+    """Create a stub NetworkManager with specified response.
 
     Args:
         response: Dict to return from http_get, or None for failure
 
     Returns:
-        Mock NetworkManager instance
+        _StubNetwork instance
     """
-    mock = Mock()
-    mock.http_get.return_value = response
-    return mock
+    return _StubNetwork(response)
+
+
+# Well-formed server response in the unified format
+UNIFIED_RESPONSE = {
+    "mode": "dayNight",
+    "serverTime": FROZEN_TIME,
+    "brightnessSchedule": [
+        {"time": "06:30", "unixTime": 1000, "warmBrightness": 20, "coolBrightness": 0, "label": "dawn"},
+        {"time": "07:00", "unixTime": 2000, "warmBrightness": 75, "coolBrightness": 100, "label": "sunrise"},
+    ]
+}
+
+
+@pytest.fixture(scope="class")
+def manager():
+    """ScheduleManager shared by a test class; only for stateless helpers."""
+    return ScheduleManager(create_mock_network(), "http://test", "token")
 
 
 class TestProcessBrightnessSchedule:
     """Tests for _process_brightness_schedule method."""
 
-    def test_valid_entries_are_processed(self):
+    def test_valid_entries_are_processed(self, manager):
         """Valid entries are converted to internal format."""
-        network = create_mock_network()
-        manager = ScheduleManager(network, "http://test", "token")
-
         schedule = [
             {"unixTime": 1000, "warmBrightness": 50, "coolBrightness": 30, "label": "test1"},
             {"unixTime": 2000, "warmBrightness": 100, "coolBrightness": 0, "label": "test2"},
@@ -44,11 +70,8 @@ class TestProcessBrightnessSchedule:
         assert result[0] == {"unix_time": 1000, "warm": 0.5, "cool": 0.3, "label": "test1"}
         assert result[1] == {"unix_time": 2000, "warm": 1.0, "cool": 0.0, "label": "test2"}
 
-    def test_brightness_normalized_to_float(self):
+    def test_brightness_normalized_to_float(self, manager):
         """Brightness values are normalized from 0-100 to 0.0-1.0."""
-        network = create_mock_network()
-        manager = ScheduleManager(network, "http://test", "token")
-
         schedule = [
             {"unixTime": 1000, "warmBrightness": 0, "coolBrightness": 100, "label": "test"},
         ]
@@ -58,11 +81,8 @@ class TestProcessBrightnessSchedule:
         assert result[0]["warm"] == 0.0
         assert result[0]["cool"] == 1.0
 
-    def test_missing_unix_time_skipped(self):
+    def test_missing_unix_time_skipped(self, manager):
         """Entries without unixTime are skipped."""
-        network = create_mock_network()
-        manager = ScheduleManager(network, "http://test", "token")
-
         schedule = [
             {"warmBrightness": 50, "coolBrightness": 30, "label": "missing_time"},
             {"unixTime": 1000, "warmBrightness": 50, "coolBrightness": 30, "label": "valid"},
@@ -73,11 +93,8 @@ class TestProcessBrightnessSchedule:
         assert len(result) == 1
         assert result[0]["label"] == "valid"
 
-    def test_missing_brightness_skipped(self):
+    def test_missing_brightness_skipped(self, manager):
         """Entries without brightness values are skipped."""
-        network = create_mock_network()
-        manager = ScheduleManager(network, "http://test", "token")
-
         schedule = [
             {"unixTime": 1000, "coolBrightness": 30, "label": "missing_warm"},
             {"unixTime": 2000, "warmBrightness": 50, "label": "missing_cool"},
@@ -89,11 +106,8 @@ class TestProcessBrightnessSchedule:
         assert len(result) == 1
         assert result[0]["label"] == "valid"
 
-    def test_invalid_brightness_skipped(self):
+    def test_invalid_brightness_skipped(self, manager):
         """Entries with brightness values outside 0-100 are skipped."""
-        network = create_mock_network()
-        manager = ScheduleManager(network, "http://test", "token")
-
         schedule = [
             {"unixTime": 1000, "warmBrightness": -10, "coolBrightness": 30, "label": "negative"},
             {"unixTime": 2000, "warmBrightness": 50, "coolBrightness": 150, "label": "over_100"},
@@ -105,11 +119,8 @@ class TestProcessBrightnessSchedule:
         assert len(result) == 1
         assert result[0]["label"] == "valid"
 
-    def test_entries_sorted_by_unix_time(self):
+    def test_entries_sorted_by_unix_time(self, manager):
         """Entries are sorted chronologically by unix_time."""
-        network = create_mock_network()
-        manager = ScheduleManager(network, "http://test", "token")
-
         schedule = [
             {"unixTime": 3000, "warmBrightness": 30, "coolBrightness": 30, "label": "third"},
             {"unixTime": 1000, "warmBrightness": 10, "coolBrightness": 10, "label": "first"},
@@ -122,11 +133,8 @@ class TestProcessBrightnessSchedule:
         assert result[1]["label"] == "second"
         assert result[2]["label"] == "third"
 
-    def test_missing_label_defaults_to_empty_string(self):
+    def test_missing_label_defaults_to_empty_string(self, manager):
         """Entries without label get empty string as default."""
-        network = create_mock_network()
-        manager = ScheduleManager(network, "http://test", "token")
-
         schedule = [
             {"unixTime": 1000, "warmBrightness": 50, "coolBrightness": 30},
         ]
@@ -135,17 +143,13 @@ class TestProcessBrightnessSchedule:
 
         assert result[0]["label"] == ""
 
-    @settings(max_examples=100)
     @given(
         unix_time=st.integers(min_value=0, max_value=2000000000),
         warm=st.integers(min_value=0, max_value=100),
         cool=st.integers(min_value=0, max_value=100)
     )
-    def test_property_brightness_normalization(self, unix_time, warm, cool):
+    def test_property_brightness_normalization(self, manager, unix_time, warm, cool):
         """Property: Brightness values are correctly normalized to 0.0-1.0."""
-        network = create_mock_network()
-        manager = ScheduleManager(network, "http://test", "token")
-
         schedule = [
             {"unixTime": unix_time, "warmBrightness": warm, "coolBrightness": cool, "label": "test"},
         ]
@@ -153,132 +157,97 @@ class TestProcessBrightnessSchedule:
         result = manager._process_brightness_schedule(schedule)
 
         assert len(result) == 1
-        assert abs(result[0]["warm"] - warm / 100.0) < 0.0001
-        assert abs(result[0]["cool"] - cool / 100.0) < 0.0001
+        assert result[0]["warm"] == pytest.approx(warm / 100.0, abs=1e-4)
+        assert result[0]["cool"] == pytest.approx(cool / 100.0, abs=1e-4)
 
 
+@pytest.mark.usefixtures("frozen_time")
 class TestCheckClockDrift:
     """Tests for _check_clock_drift method."""
 
-    def test_no_warning_within_threshold(self, capsys):
+    def test_no_warning_within_threshold(self, manager):
         """No warning when drift is within 5 minute threshold."""
-        network = create_mock_network()
-        manager = ScheduleManager(network, "http://test", "token")
+        server_time = FROZEN_TIME + 60  # 1 minute drift
 
-        current_time = int(time.time())
-        server_time = current_time + 60  # 1 minute drift
+        assert manager._check_clock_drift(server_time) == (60, False)
 
-        manager._check_clock_drift(server_time)
-
-        captured = capsys.readouterr()
-        assert "Warning" not in captured.out
-
-    def test_warning_when_drift_exceeds_threshold(self, capsys):
+    def test_warning_when_drift_exceeds_threshold(self, manager):
         """Warning logged when drift exceeds 5 minute threshold."""
-        network = create_mock_network()
-        manager = ScheduleManager(network, "http://test", "token")
-
-        current_time = int(time.time())
-        server_time = current_time + 400  # ~6.7 minutes drift
+        server_time = FROZEN_TIME + 400  # ~6.7 minutes drift
 
-        manager._check_clock_drift(server_time)
+        drift, warned = manager._check_clock_drift(server_time)
 
-        captured = capsys.readouterr()
-        assert "Warning: Clock drift detected" in captured.out
-        assert "Drift=400s" in captured.out
+        assert warned is True
+        assert drift == 400
 
-    def test_warning_for_negative_drift(self, capsys):
+    def test_warning_for_negative_drift(self, manager):
         """Warning logged for negative drift (server behind local)."""
-        network = create_mock_network()
-        manager = ScheduleManager(network, "http://test", "token")
-
-        current_time = int(time.time())
-        server_time = current_time - 400  # Server 6.7 minutes behind
+        server_time = FROZEN_TIME - 400  # Server 6.7 minutes behind
 
-        manager._check_clock_drift(server_time)
+        drift, warned = manager._check_clock_drift(server_time)
 
-        captured = capsys.readouterr()
-        assert "Warning: Clock drift detected" in captured.out
+        assert warned is True
+        assert drift == 400
 
-    def test_exactly_at_threshold_no_warning(self, capsys):
+    def test_exactly_at_threshold_no_warning(self, manager):
         """No warning when drift is exactly at threshold (300s)."""
-        network = create_mock_network()
-        manager = ScheduleManager(network, "http://test", "token")
+        server_time = FROZEN_TIME + 300  # Exactly 5 minutes
 
-        current_time = int(time.time())
-        server_time = current_time + 300  # Exactly 5 minutes
-
-        manager._check_clock_drift(server_time)
-
-        captured = capsys.readouterr()
-        assert "Warning" not in captured.out
+        assert manager._check_clock_drift(server_time) == (300, False)
 
 
+@pytest.mark.usefixtures("frozen_time")
 class TestFetchSchedule:
     """Tests for fetch_schedule method with unified format."""
 
-    def test_successful_fetch_with_unified_format(self):
-        """Successfully fetches and processes unified format response."""
-        response = {
-            "mode": "dayNight",
-            "serverTime": int(time.time()),
-            "brightnessSchedule": [
-                {"time": "06:30", "unixTime": 1000, "warmBrightness": 20, "coolBrightness": 0, "label": "dawn"},
-                {"time": "07:00", "unixTime": 2000, "warmBrightness": 75, "coolBrightness": 100, "label": "sunrise"},
-            ]
-        }
+    @pytest.mark.parametrize(
+        "response, expected, num_entries",
+        [
+            pytest.param(UNIFIED_RESPONSE, True, 2, id="success"),
+            pytest.param(
+                {"mode": "dayNight", "serverTime": FROZEN_TIME, "brightnessSchedule": []},
+                False, 0, id="empty_brightness_schedule",
+            ),
+            pytest.param({"mode": "dayNight", "serverTime": FROZEN_TIME}, False, 0, id="missing_brightness_schedule"),
+            pytest.param(None, False, 0, id="network_failure"),
+        ],
+    )
+    def test_fetch_result(self, response, expected, num_entries):
+        """fetch_schedule succeeds only for a non-empty brightnessSchedule."""
         network = create_mock_network(response)
         manager = ScheduleManager(network, "http://test", "token")
 
-        result = manager.fetch_schedule()
+        assert manager.fetch_schedule() is expected
+        assert len(manager.get_entries()) == num_entries
+
+    def test_unified_format_is_processed(self):
+        """Successfully fetched entries carry the mode and normalized brightness."""
+        network = create_mock_network(UNIFIED_RESPONSE)
+        manager = ScheduleManager(network, "http://test", "token")
+
+        manager.fetch_schedule()
 
-        assert result is True
         assert manager.get_mode() == "dayNight"
         entries = manager.get_entries()
-        assert len(entries) == 2
         assert entries[0]["warm"] == 0.2
         assert entries[1]["cool"] == 1.0
 
-    def test_empty_brightness_schedule_returns_false(self):
-        """Returns False when brightnessSchedule is empty."""
-        response = {
-            "mode": "dayNight",
-            "serverTime": int(time.time()),
-            "brightnessSchedule": []
-        }
-        network = create_mock_network(response)
-        manager = ScheduleManager(network, "http://test", "token")
-
-        result = manager.fetch_schedule()
-
-        assert result is False
-
-    def test_missing_brightness_schedule_returns_false(self):
-        """Returns False when brightnessSchedule is missing."""
-        response = {
-            "mode": "dayNight",
-            "serverTime": int(time.time()),
-        }
-        network = create_mock_network(response)
-        manager = ScheduleManager(network, "http://test", "token")
-
-        result = manager.fetch_schedule()
-
-        assert result is False
-
-    def test_network_failure_returns_false(self):
-        """Returns False when network request fails."""
-        network = create_mock_network(None)
-        manager = ScheduleManager(network, "http://test", "token")
+    def test_entries_are_stable_until_refetched(self):
+        """get_entries returns the same tuple until the schedule is replaced."""
+        manager = ScheduleManager(create_mock_network(UNIFIED_RESPONSE), "http://test", "token")
+        manager.fetch_schedule()
 
-        result = manager.fetch_schedule()
+        entries = manager.get_entries()
+        assert isinstance(entries, tuple)
+        assert manager.get_entries() is entries
 
-        assert result is False
+        manager.fetch_schedule()
+        assert manager.get_entries() is not entries
 
-    def test_clock_drift_check_called_with_server_time(self, capsys):
+    def test_clock_drift_check_called_with_server_time(self):
         """Clock drift check is performed when serverTime is present."""
         # Server time 10 minutes in future - should trigger warning
-        server_time = int(time.time()) + 600
+        server_time = FROZEN_TIME + 600
         response = {
             "mode": "dayNight",
             "serverTime": server_time,
@@ -289,10 +258,11 @@ class TestFetchSchedule:
         network = create_mock_network(response)
         manager = ScheduleManager(network, "http://test", "token")
 
-        manager.fetch_schedule()
+        with patch.object(manager, "_check_clock_drift", wraps=manager._check_clock_drift) as drift_check:
+            manager.fetch_schedule()
 
-        captured = capsys.readouterr()
-        assert "Warning: Clock drift detected" in captured.out
+        drift_check.assert_called_once_with(server_time)
+        assert manager._check_clock_drift(server_time) == (600, True)
 
     def test_demo_mode_uses_config_schedule(self):
         """Demo mode uses hardcoded config schedule, not server entries."""
@@ -319,7 +289,7 @@ class TestFetchSchedule:
         """last_fetch_time is updated on successful fetch."""
         response = {
             "mode": "dayNight",
-            "serverTime": int(time.time()),
+            "serverTime": FROZEN_TIME,
             "brightnessSchedule": [
                 {"unixTime": 1000, "warmBrightness": 50, "coolBrightness": 50, "label": "test"},
             ]
@@ -327,11 +297,89 @@ class TestFetchSchedule:
         network = create_mock_network(response)
         manager = ScheduleManager(network, "http://test", "token")
 
-        before = int(time.time())
         manager.fetch_schedule()
-        after = int(time.time())
 
-        assert before <= manager.get_last_fetch_time() <= after
+        assert manager.get_last_fetch_time() == FROZEN_TIME
+
+    def test_listeners_notified_on_successful_fetch(self):
+        """Registered listeners receive the new entries and mode after a fetch."""
+        manager = ScheduleManager(create_mock_network(UNIFIED_RESPONSE), "http://test", "token")
+        calls = []
+        manager.add_listener(lambda *args: calls.append(args))
+
+        manager.fetch_schedule()
+
+        assert calls == [(manager.get_entries(), False, manager.get_demo_cycle_duration())]
+
+    def test_listeners_not_notified_on_failed_fetch(self):
+        """A failed fetch leaves the cache, and so the listeners, untouched."""
+        manager = ScheduleManager(create_mock_network(None), "http://test", "token")
+        calls = []
+        manager.add_listener(lambda *args: calls.append(args))
+
+        manager.fetch_schedule()
+
+        assert calls == []
+
+    def test_failed_fetch_does_not_change_mode(self):
+        """A refresh with a new mode but no usable entries keeps the old mode.
+
+        Listeners are only told about cache replacements, so the mode must not
+        move on its own or they would disagree with is_demo_mode().
+        """
+        network = create_mock_network({"mode": "demo"})
+
+        with patch('schedule_manager.config') as mock_config:
+            mock_config.DEFAULT_SCHEDULE_MODE = "dayNight"
+            mock_config.DEMO_SCHEDULE = [
+                (0, 10, 0, "night"),
+                (5, 50, 50, "day"),
+            ]
+            mock_config.DEMO_CYCLE_DURATION_S = 15
+
+            manager = ScheduleManager(network, "http://test", "token")
+            assert manager.fetch_schedule() is True
+
+            calls = []
+            manager.add_listener(lambda *args: calls.append(args))
+            network.response = {"mode": "dayNight", "serverTime": FROZEN_TIME, "brightnessSchedule": []}
+
+            assert manager.fetch_schedule() is False
+            assert manager.is_demo_mode() is True
+            assert manager.get_mode() == "demo"
+            assert calls == []
+
+
+@pytest.mark.usefixtures("frozen_time")
+class TestDemoElapsed:
+    """Tests for get_demo_elapsed_s."""
+
+    def test_elapsed_ignores_wall_clock_steps(self, frozen_time, monkeypatch):
+        """Demo position follows the monotonic clock, not time.time()."""
+        monkeypatch.setattr(time, "monotonic", lambda: 500.0)
+
+        with patch('schedule_manager.config') as mock_config:
+            mock_config.DEFAULT_SCHEDULE_MODE = "dayNight"
+            mock_config.DEMO_SCHEDULE = [
+                (0, 10, 0, "night"),
+                (5, 50, 50, "day"),
+            ]
+            mock_config.DEMO_CYCLE_DURATION_S = 15
+
+            manager = ScheduleManager(create_mock_network({"mode": "demo"}), "http://test", "token")
+            assert manager.fetch_schedule() is True
+
+            # NTP steps the wall clock an hour forward while 2.5s really pass
+            frozen_time.set_time(FROZEN_TIME + 3600)
+            monkeypatch.setattr(time, "monotonic", lambda: 502.5)
+
+            assert manager.get_demo_elapsed_s() == 2.5
+
+    def test_zero_without_schedule(self):
+        """No demo schedule set up yet means no elapsed time."""
+        manager = ScheduleManager(create_mock_network(), "http://test", "token")
+
+        assert manager.get_demo_elapsed_s() == 0.0
 
 
 class TestNeedsRefresh:
@@ -360,6 +408,96 @@ class TestNeedsRefresh:
         assert manager.needs_refresh() is False
 
 
+class TestStaleWhileRevalidate:
+    """The cached schedule keeps serving while a refresh is due or failing.
+
+    needs_refresh() turns True once the refresh interval has elapsed, or once
+    now passes the last entry by the stale threshold, while get_entries()
+    keeps serving the cached schedule either way; a failed fetch never clears
+    the cache.
+    """
+
+    @pytest.fixture
+    def fetched(self, frozen_time):
+        """Manager with a schedule fetched at FROZEN_TIME, plus a clock setter."""
+        response = {
+            "mode": "dayNight",
+            "serverTime": FROZEN_TIME,
+            "brightnessSchedule": [
+                {"unixTime": FROZEN_TIME + 86400, "warmBrightness": 50, "coolBrightness": 50, "label": "tomorrow"},
+            ]
+        }
+        network = create_mock_network(response)
+        manager = ScheduleManager(network, "http://test", "token", refresh_hours=6)
+        assert manager.fetch_schedule() is True
+
+        def advance(seconds):
+            frozen_time.set_time(FROZEN_TIME + seconds)
+
+        return manager, network, advance
+
+    def test_refresh_due_after_interval_while_cache_still_served(self, fetched):
+        """Past the refresh interval a refresh is due, but entries stay available."""
+        manager, _, advance = fetched
+        entries = manager.get_entries()
+
+        advance(6 * 3600 - 1)
+        assert manager.needs_refresh() is False
+
+        advance(6 * 3600 + 1)
+        assert manager.needs_refresh() is True
+        assert manager.get_entries() is entries
+        assert manager.has_valid_schedule() is True
+
+    def test_refresh_due_past_last_entry_while_cache_still_served(self, frozen_time):
+        """Past the last entry plus the stale threshold a refresh is due, but entries stay."""
+        response = {
+            "mode": "dayNight",
+            "serverTime": FROZEN_TIME,
+            "brightnessSchedule": [
+                {"unixTime": FROZEN_TIME, "warmBrightness": 50, "coolBrightness": 50, "label": "now"},
+            ]
+        }
+        # Long refresh interval so only the stale threshold can trigger
+        with patch('schedule_manager.config', None):
+            manager = ScheduleManager(create_mock_network(response), "http://test", "token", refresh_hours=48)
+            assert manager.fetch_schedule() is True
+            entries = manager.get_entries()
+            stale_at = FROZEN_TIME + ScheduleManager.STALE_THRESHOLD
+
+            frozen_time.set_time(stale_at)
+            assert manager.needs_refresh() is False
+
+            frozen_time.set_time(stale_at + 1)
+            assert manager.needs_refresh() is True
+            assert manager.get_entries() is entries
+            assert manager.has_valid_schedule() is True
+
+    def test_failed_refresh_keeps_cached_schedule(self, fetched):
+        """A failed revalidation leaves the stale schedule and fetch time untouched."""
+        manager, network, advance = fetched
+        entries = manager.get_entries()
+
+        advance(6 * 3600 + 1)
+        network.response = None
+
+        assert manager.fetch_schedule() is False
+        assert manager.get_entries() is entries
+        assert manager.has_valid_schedule() is True
+        assert manager.get_last_fetch_time() == FROZEN_TIME
+        assert manager.needs_refresh() is True
+
+    def test_successful_refresh_resets_interval(self, fetched):
+        """A successful revalidation stamps the new fetch time."""
+        manager, _, advance = fetched
+
+        advance(6 * 3600 + 1)
+        assert manager.fetch_schedule() is True
+
+        assert manager.get_last_fetch_time() == FROZEN_TIME + 6 * 3600 + 1
+        assert manager.needs_refresh() is False
+
+
 class TestHasValidSchedule:
     """Tests for has_valid_schedule method."""
 
@@ -1,19 +1,65 @@
 """Property-based tests for Transition Engine module.
 
-Uses hypothesis for property-based testing with minimum 100 iterations per property.
-Tests linear interpolation, brightness at entry times, and past entry handling.
+Uses hypothesis for property-based testing; example counts come from the active
+hypothesis profile (see conftest.py). Linear interpolation is checked over a
+seeded bulk sample, with a small hypothesis smoke test alongside. Also tests
+brightness at entry times and past entry handling.
 """
 
+import pytest
 from hypothesis import given, settings, strategies as st
-from unittest.mock import Mock
+from bisect import bisect_right
+import random
 import time
 
+from tests.mocks import FROZEN_TIME, MockLEDDriver
 from transition_engine import TransitionEngine
-from led_driver import LEDDriver
+
+
+class _StubScheduleManager:
+    """Minimal ScheduleManager stand-in exposing only what TransitionEngine reads."""
+
+    __slots__ = ('_entries', '_listeners', 'has_valid', 'is_demo', 'elapsed')
+
+    def __init__(self, entries, has_valid, is_demo):
+        self._entries = entries
+        self._listeners = []
+        self.has_valid = has_valid
+        self.is_demo = is_demo
+        self.elapsed = 0.0
+
+    @property
+    def entries(self):
+        return self._entries
+
+    @entries.setter
+    def entries(self, entries):
+        # Mirror ScheduleManager: every cache replacement notifies listeners
+        self._entries = entries
+        for callback in self._listeners:
+            callback(entries, self.is_demo, self.get_demo_cycle_duration())
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def get_entries(self):
+        return self._entries
+
+    def has_valid_schedule(self):
+        return self.has_valid
+
+    def is_demo_mode(self):
+        return self.is_demo
+
+    def get_demo_cycle_duration(self):
+        return 15
+
+    def get_demo_elapsed_s(self):
+        return self.elapsed
 
 
 def create_mock_schedule_manager(entries=None, has_valid=True, is_demo=False):
-    """Create a mock ScheduleManager with specified entries.
+    """Create a stub ScheduleManager with specified entries.
 
     Args:
         entries: List of schedule entry dicts, or None for empty schedule
@@ -21,20 +67,68 @@ def create_mock_schedule_manager(entries=None, has_valid=True, is_demo=False):
         is_demo: Whether is_demo_mode() returns True
 
     Returns:
-        Mock ScheduleManager instance
+        _StubScheduleManager instance
     """
-    mock = Mock()
-    mock.get_entries.return_value = entries if entries else []
-    mock.has_valid_schedule.return_value = has_valid and entries is not None and len(entries) > 0
-    mock.is_demo_mode.return_value = is_demo
-    mock.get_demo_cycle_duration.return_value = 15
-    return mock
+    return _StubScheduleManager(
+        entries if entries else [],
+        has_valid and entries is not None and len(entries) > 0,
+        is_demo,
+    )
+
+
+# Built once per test class; each hypothesis example only swaps the stub's entries
+@pytest.fixture(scope="class")
+def stub_schedule():
+    """Stub schedule manager shared by every example in a class."""
+    return create_mock_schedule_manager()
+
+
+@pytest.fixture(scope="class")
+def engine(stub_schedule, led):
+    """TransitionEngine reading from stub_schedule."""
+    return TransitionEngine(stub_schedule, led)
 
 
 class TestTransitionEngineProperties:
     """Property-based tests for TransitionEngine class."""
 
-    @settings(max_examples=100)
+    # Five hourly entries from FROZEN_TIME with distinct brightness values
+    _ENTRY_TEMPLATE = [
+        {
+            "unix_time": FROZEN_TIME + (i * 3600),
+            "warm": (i * 0.2) % 1.0,
+            "cool": ((i + 1) * 0.15) % 1.0,
+            "label": f"entry_{i}",
+        }
+        for i in range(5)
+    ]
+
+    def test_linear_interpolation_bulk(self, engine, stub_schedule, clock):
+        """Property 3 over a fixed pseudo-random sample of 10,000 points.
+
+        The interpolation formula is a plain algebraic identity, so a seeded
+        bulk sample covers it far more densely than per-example generation.
+        The hypothesis property below is kept as a small smoke test.
+        """
+        rng = random.Random(0)
+        duration = 3600
+
+        results = []
+        expected = []
+        for _ in range(10000):
+            sw, sc, ew, ec, p = (rng.random() for _ in range(5))
+            stub_schedule.entries = [
+                {"unix_time": FROZEN_TIME, "warm": sw, "cool": sc, "label": "start"},
+                {"unix_time": FROZEN_TIME + duration, "warm": ew, "cool": ec, "label": "end"},
+            ]
+            clock.set_time(FROZEN_TIME + duration * p)
+            results.extend(engine.get_current_target())
+            expected.append(sw + (ew - sw) * p)
+            expected.append(sc + (ec - sc) * p)
+
+        assert results == pytest.approx(expected, abs=1e-4)
+
+    @settings(max_examples=10)
     @given(
         start_warm=st.floats(min_value=0.0, max_value=1.0, allow_nan=False),
         start_cool=st.floats(min_value=0.0, max_value=1.0, allow_nan=False),
@@ -42,7 +136,7 @@ class TestTransitionEngineProperties:
         end_cool=st.floats(min_value=0.0, max_value=1.0, allow_nan=False),
         progress=st.floats(min_value=0.0, max_value=1.0, allow_nan=False)
     )
-    def test_linear_interpolation_correctness(self, start_warm, start_cool, end_warm, end_cool, progress):
+    def test_linear_interpolation_correctness(self, engine, stub_schedule, clock, start_warm, start_cool, end_warm, end_cool, progress):
         """Property 3: Linear Interpolation Correctness
         
         For any start brightness, end brightness, and progress value in [0.0, 1.0],
@@ -52,7 +146,7 @@ class TestTransitionEngineProperties:
         Validates: Requirements 2.6
         """
         # Create schedule with two entries
-        base_time = int(time.time())
+        base_time = FROZEN_TIME
         duration = 3600  # 1 hour between entries
         
         entries = [
@@ -60,39 +154,30 @@ class TestTransitionEngineProperties:
             {"unix_time": base_time + duration, "warm": end_warm, "cool": end_cool, "label": "end"}
         ]
         
-        mock_schedule = create_mock_schedule_manager(entries)
-        led = LEDDriver(warm_pin=10, cool_pin=20)
-        engine = TransitionEngine(mock_schedule, led)
+        stub_schedule.entries = entries
         
         # Calculate the time that corresponds to the given progress
         current_time = base_time + (duration * progress)
         
-        # Mock time.time() to return our calculated time
-        import transition_engine
-        original_time = transition_engine.time.time
-        transition_engine.time.time = lambda: current_time
-        
-        try:
-            warm, cool = engine.get_current_target()
-            
-            # Calculate expected values using linear interpolation formula
-            expected_warm = start_warm + (end_warm - start_warm) * progress
-            expected_cool = start_cool + (end_cool - start_cool) * progress
-            
-            # Allow small floating point tolerance
-            assert abs(warm - expected_warm) < 0.0001, f"Warm: {warm} != {expected_warm}"
-            assert abs(cool - expected_cool) < 0.0001, f"Cool: {cool} != {expected_cool}"
-        finally:
-            transition_engine.time.time = original_time
-
-
-    @settings(max_examples=100)
+        # Point the patched time.time() at our calculated time
+        clock.set_time(current_time)
+        warm, cool = engine.get_current_target()
+        
+        # Calculate expected values using linear interpolation formula
+        expected_warm = start_warm + (end_warm - start_warm) * progress
+        expected_cool = start_cool + (end_cool - start_cool) * progress
+        
+        # Allow small floating point tolerance
+        assert warm == pytest.approx(expected_warm, abs=1e-4)
+        assert cool == pytest.approx(expected_cool, abs=1e-4)
+
+
     @given(
         warm=st.floats(min_value=0.0, max_value=1.0, allow_nan=False),
         cool=st.floats(min_value=0.0, max_value=1.0, allow_nan=False),
-        entry_index=st.integers(min_value=0, max_value=3)  # 0-3 to leave room for next entry
+        entry_index=st.integers(min_value=0, max_value=4)
     )
-    def test_brightness_equals_entry_at_entry_time(self, warm, cool, entry_index):
+    def test_brightness_equals_entry_at_entry_time(self, engine, stub_schedule, clock, warm, cool, entry_index):
         """Property 4: Brightness Equals Entry at Entry Time
         
         For any schedule with entries and any time T exactly equal to an entry's
@@ -102,64 +187,31 @@ class TestTransitionEngineProperties:
         Feature: lamp-controller-refactor, Property 4: Brightness Equals Entry at Entry Time
         Validates: Requirements 4.1
         """
-        # Create schedule with multiple entries
-        base_time = int(time.time())
-        num_entries = 5
-        
-        entries = []
-        for i in range(num_entries):
-            # Use different brightness for each entry, but the target entry uses our test values
-            if i == entry_index:
-                entries.append({
-                    "unix_time": base_time + (i * 3600),
-                    "warm": warm,
-                    "cool": cool,
-                    "label": f"entry_{i}"
-                })
-            else:
-                # Other entries have different values
-                entries.append({
-                    "unix_time": base_time + (i * 3600),
-                    "warm": (i * 0.2) % 1.0,
-                    "cool": ((i + 1) * 0.15) % 1.0,
-                    "label": f"entry_{i}"
-                })
+        # Copy the template, then give the target entry our test values
+        entries = [dict(e) for e in self._ENTRY_TEMPLATE]
+        entries[entry_index]["warm"] = warm
+        entries[entry_index]["cool"] = cool
         
-        mock_schedule = create_mock_schedule_manager(entries)
-        led = LEDDriver(warm_pin=10, cool_pin=20)
-        engine = TransitionEngine(mock_schedule, led)
+        stub_schedule.entries = entries
         
         # Set time exactly at the target entry
         target_time = entries[entry_index]["unix_time"]
         
-        import transition_engine
-        original_time = transition_engine.time.time
-        transition_engine.time.time = lambda: float(target_time)
-        
-        try:
-            result_warm, result_cool = engine.get_current_target()
-            
-            # At exactly entry time T:
-            # - The loop finds the first entry where unix_time > T
-            # - prev_entry is set to the entry at T (our target entry)
-            # - elapsed = T - T = 0, so progress = 0
-            # - Result = prev_entry's brightness = our target entry's brightness
-            #
-            # Exception: If entry_index is the last entry (4), we're past all entries
-            # and return the last entry's brightness directly.
-            # We limit entry_index to 0-3 to ensure there's always a next entry.
-            
-            assert abs(result_warm - warm) < 0.0001, f"Warm: {result_warm} != {warm}"
-            assert abs(result_cool - cool) < 0.0001, f"Cool: {result_cool} != {cool}"
-        finally:
-            transition_engine.time.time = original_time
-
-    @settings(max_examples=100)
+        clock.set_time(float(target_time))
+        result_warm, result_cool = engine.get_current_target()
+        
+        # At exactly entry time T, bisect_right selects the segment that starts
+        # at T (the trailing sentinel for the last entry), so the engine adds
+        # slope * (T - T) = 0 to the target entry's brightness.
+        
+        assert result_warm == pytest.approx(warm, abs=1e-4)
+        assert result_cool == pytest.approx(cool, abs=1e-4)
+
     @given(
         num_past_entries=st.integers(min_value=2, max_value=5),
         time_offset=st.floats(min_value=0.1, max_value=0.9, allow_nan=False)
     )
-    def test_skip_to_most_recent_past_entry(self, num_past_entries, time_offset):
+    def test_skip_to_most_recent_past_entry(self, engine, stub_schedule, clock, num_past_entries, time_offset):
         """Property 5: Skip to Most Recent Past Entry
         
         For any schedule and any time T that is past multiple entries but before
@@ -169,7 +221,7 @@ class TestTransitionEngineProperties:
         Feature: lamp-controller-refactor, Property 5: Skip to Most Recent Past Entry
         Validates: Requirements 4.4
         """
-        base_time = int(time.time())
+        base_time = FROZEN_TIME
         
         # Create entries: some in the past, one in the future
         entries = []
@@ -190,51 +242,48 @@ class TestTransitionEngineProperties:
         }
         entries.append(future_entry)
         
-        mock_schedule = create_mock_schedule_manager(entries)
-        led = LEDDriver(warm_pin=10, cool_pin=20)
-        engine = TransitionEngine(mock_schedule, led)
+        stub_schedule.entries = entries
         
         # Set current time between last past entry and future entry
         most_recent_past = entries[num_past_entries - 1]
         duration = future_entry["unix_time"] - most_recent_past["unix_time"]
         current_time = most_recent_past["unix_time"] + (duration * time_offset)
         
-        import transition_engine
-        original_time = transition_engine.time.time
-        transition_engine.time.time = lambda: current_time
-        
-        try:
-            warm, cool = engine.get_current_target()
-            
-            # Brightness should be interpolated between most recent past and future
-            # It should be between the two values (or equal if they're the same)
-            prev_warm = most_recent_past["warm"]
-            next_warm = future_entry["warm"]
-            prev_cool = most_recent_past["cool"]
-            next_cool = future_entry["cool"]
-            
-            # Check warm is between prev and next (inclusive)
-            min_warm = min(prev_warm, next_warm)
-            max_warm = max(prev_warm, next_warm)
-            assert min_warm - 0.0001 <= warm <= max_warm + 0.0001, \
-                f"Warm {warm} not between {min_warm} and {max_warm}"
-            
-            # Check cool is between prev and next (inclusive)
-            min_cool = min(prev_cool, next_cool)
-            max_cool = max(prev_cool, next_cool)
-            assert min_cool - 0.0001 <= cool <= max_cool + 0.0001, \
-                f"Cool {cool} not between {min_cool} and {max_cool}"
-        finally:
-            transition_engine.time.time = original_time
+        clock.set_time(current_time)
+        warm, cool = engine.get_current_target()
+        
+        # The entry the engine should start from is the last one at or before now
+        times = [e["unix_time"] for e in entries]
+        idx = bisect_right(times, current_time) - 1
+        assert idx == num_past_entries - 1
+        prev_entry, next_entry = entries[idx], entries[idx + 1]
+        
+        # Brightness should be interpolated between most recent past and future
+        # It should be between the two values (or equal if they're the same)
+        prev_warm = prev_entry["warm"]
+        next_warm = next_entry["warm"]
+        prev_cool = prev_entry["cool"]
+        next_cool = next_entry["cool"]
+        
+        # Check warm is between prev and next (inclusive)
+        min_warm = min(prev_warm, next_warm)
+        max_warm = max(prev_warm, next_warm)
+        assert min_warm - 0.0001 <= warm <= max_warm + 0.0001, \
+            f"Warm {warm} not between {min_warm} and {max_warm}"
+        
+        # Check cool is between prev and next (inclusive)
+        min_cool = min(prev_cool, next_cool)
+        max_cool = max(prev_cool, next_cool)
+        assert min_cool - 0.0001 <= cool <= max_cool + 0.0001, \
+            f"Cool {cool} not between {min_cool} and {max_cool}"
 
 
 class TestTransitionEngineEdgeCases:
     """Unit tests for edge cases in TransitionEngine."""
 
-    def test_no_schedule_returns_night_light(self):
+    def test_no_schedule_returns_night_light(self, led):
         """When no schedule exists, return night light fallback."""
         mock_schedule = create_mock_schedule_manager(entries=None)
-        led = LEDDriver(warm_pin=10, cool_pin=20)
         engine = TransitionEngine(mock_schedule, led)
         
         warm, cool = engine.get_current_target()
@@ -242,10 +291,18 @@ class TestTransitionEngineEdgeCases:
         assert warm == TransitionEngine.NIGHT_LIGHT_WARM
         assert cool == TransitionEngine.NIGHT_LIGHT_COOL
 
-    def test_empty_schedule_returns_night_light(self):
+    def test_none_entries_returns_night_light(self, led):
+        """A manager reporting None entries is treated as having no schedule."""
+        engine = TransitionEngine(_StubScheduleManager(None, False, False), led)
+
+        warm, cool = engine.get_current_target()
+
+        assert warm == TransitionEngine.NIGHT_LIGHT_WARM
+        assert cool == TransitionEngine.NIGHT_LIGHT_COOL
+
+    def test_empty_schedule_returns_night_light(self, led):
         """When schedule is empty, return night light fallback."""
         mock_schedule = create_mock_schedule_manager(entries=[])
-        led = LEDDriver(warm_pin=10, cool_pin=20)
         engine = TransitionEngine(mock_schedule, led)
         
         warm, cool = engine.get_current_target()
@@ -253,7 +310,7 @@ class TestTransitionEngineEdgeCases:
         assert warm == TransitionEngine.NIGHT_LIGHT_WARM
         assert cool == TransitionEngine.NIGHT_LIGHT_COOL
 
-    def test_past_all_entries_returns_last_brightness(self):
+    def test_past_all_entries_returns_last_brightness(self, led):
         """When current time is past all entries, return last entry's brightness."""
         base_time = int(time.time()) - 7200  # 2 hours ago
         
@@ -263,7 +320,6 @@ class TestTransitionEngineEdgeCases:
         ]
         
         mock_schedule = create_mock_schedule_manager(entries)
-        led = LEDDriver(warm_pin=10, cool_pin=20)
         engine = TransitionEngine(mock_schedule, led)
         
         warm, cool = engine.get_current_target()
@@ -272,7 +328,7 @@ class TestTransitionEngineEdgeCases:
         assert warm == 0.8
         assert cool == 0.6
 
-    def test_before_first_entry_returns_first_brightness(self):
+    def test_before_first_entry_returns_first_brightness(self, led):
         """When current time is before first entry, return first entry's brightness."""
         base_time = int(time.time()) + 7200  # 2 hours in future
         
@@ -282,7 +338,6 @@ class TestTransitionEngineEdgeCases:
         ]
         
         mock_schedule = create_mock_schedule_manager(entries)
-        led = LEDDriver(warm_pin=10, cool_pin=20)
         engine = TransitionEngine(mock_schedule, led)
         
         warm, cool = engine.get_current_target()
@@ -291,7 +346,7 @@ class TestTransitionEngineEdgeCases:
         assert warm == 0.5
         assert cool == 0.4
 
-    def test_update_sets_led_brightness(self):
+    def test_update_sets_led_brightness(self, led_reset):
         """update() should call set_brightness on LED driver."""
         base_time = int(time.time()) + 3600  # 1 hour in future
         
@@ -300,12 +355,80 @@ class TestTransitionEngineEdgeCases:
         ]
         
         mock_schedule = create_mock_schedule_manager(entries)
-        led = LEDDriver(warm_pin=10, cool_pin=20)
-        engine = TransitionEngine(mock_schedule, led)
+        engine = TransitionEngine(mock_schedule, led_reset)
         
         engine.update()
         
         # LED should have been set to first entry's brightness (before first entry)
-        warm, cool = led.get_brightness()
+        warm, cool = led_reset.get_brightness()
         assert warm == 0.7
         assert cool == 0.5
+
+    def test_explicit_now_is_used_instead_of_clock(self, led):
+        """get_current_target(now) evaluates at the given time, not time.time()."""
+        entries = [
+            {"unix_time": FROZEN_TIME, "warm": 0.0, "cool": 1.0, "label": "start"},
+            {"unix_time": FROZEN_TIME + 3600, "warm": 1.0, "cool": 0.0, "label": "end"}
+        ]
+
+        mock_schedule = create_mock_schedule_manager(entries)
+        engine = TransitionEngine(mock_schedule, led)
+
+        warm, cool = engine.get_current_target(FROZEN_TIME + 900)
+
+        assert warm == pytest.approx(0.25)
+        assert cool == pytest.approx(0.75)
+
+    def test_update_skips_unchanged_target(self):
+        """update() does not re-send a target the LEDs already show."""
+        entries = [
+            {"unix_time": FROZEN_TIME, "warm": 0.0, "cool": 0.0, "label": "start"},
+            {"unix_time": FROZEN_TIME + 4095 * 3600, "warm": 1.0, "cool": 1.0, "label": "end"}
+        ]
+
+        mock_led = MockLEDDriver(10, 20)
+        engine = TransitionEngine(create_mock_schedule_manager(entries), mock_led)
+
+        # One 12-bit step takes an hour on this segment
+        engine.update(FROZEN_TIME + 3600)
+        engine.update(FROZEN_TIME + 3601)
+        engine.update(FROZEN_TIME + 7200)
+
+        assert len(mock_led.set_brightness_calls) == 2
+
+    def test_update_force_writes_unchanged_target(self):
+        """update(force=True) always writes to the LEDs."""
+        entries = [
+            {"unix_time": FROZEN_TIME, "warm": 0.4, "cool": 0.2, "label": "entry"}
+        ]
+
+        mock_led = MockLEDDriver(10, 20)
+        engine = TransitionEngine(create_mock_schedule_manager(entries), mock_led)
+
+        engine.update(FROZEN_TIME)
+        engine.update(FROZEN_TIME, force=True)
+
+        assert mock_led.set_brightness_calls == [(0.4, 0.2), (0.4, 0.2)]
+
+    @pytest.mark.parametrize(
+        "elapsed, expected_warm",
+        [
+            pytest.param(5.0, 0.5, id="between_entries"),
+            pytest.param(12.5, 0.5, id="wrapping_to_first"),
+            pytest.param(30.0, 0.0, id="next_cycle"),
+        ],
+    )
+    def test_demo_mode_loops_over_cycle(self, led, elapsed, expected_warm):
+        """Demo targets ramp back from the last entry to the first each cycle."""
+        entries = [
+            {"unix_time": FROZEN_TIME, "warm": 0.0, "cool": 0.0, "label": "night"},
+            {"unix_time": FROZEN_TIME + 10, "warm": 1.0, "cool": 0.0, "label": "day"}
+        ]
+
+        mock_schedule = create_mock_schedule_manager(entries, is_demo=True)
+        mock_schedule.elapsed = elapsed
+        engine = TransitionEngine(mock_schedule, led)
+
+        warm, _ = engine.get_current_target()
+
+        assert warm == pytest.approx(expected_warm)
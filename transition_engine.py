@@ -14,6 +14,10 @@ the current time T:
     progress = (T - prev.time) / (next.time - prev.time)
     brightness = prev.brightness + (next.brightness - prev.brightness) * progress
 
+The per-segment slope (next.brightness - prev.brightness) / (next.time - prev.time)
+is computed once when the schedule changes, so each tick evaluates this as
+prev.brightness + slope * (T - prev.time).
+
 This ensures smooth, perceptually uniform transitions when combined with
 the LEDDriver's gamma correction.
 
@@ -41,161 +45,263 @@ try:
 except ImportError:
     config = None
 
+try:
+    from typing import Callable
+except ImportError:
+    # MicroPython has no typing module; annotations are not evaluated there
+    pass
+
+try:
+    import micropython
+except ImportError:
+    # Desktop Python: native code emission is a MicroPython feature, so the
+    # decorator becomes a no-op
+    class micropython:  # type: ignore[reportRedeclaration] - desktop stand-in
+        @staticmethod
+        def native(func):
+            return func
+
+try:
+    from bisect import bisect_right
+except ImportError:
+    # MicroPython firmware ships without bisect
+    @micropython.native
+    def bisect_right(a: list, x: float) -> int:
+        """Return the index after the last item in sorted list a that is <= x."""
+        lo = 0
+        hi = len(a)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if x < a[mid]:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
 from led_driver import LEDDriver
 from schedule_manager import ScheduleManager
 
 
+@micropython.native
+def _interp(x: float, xs: list, values: list, slopes: list) -> tuple[float, float]:
+    """Piecewise-linear interpolation of both channels at x.
+
+    Works like numpy.interp for two y-series sharing one x-series. The
+    series must be padded with a flat sentinel segment at each end (see
+    TransitionEngine.on_schedule_changed); positions outside xs then fall on a
+    sentinel and clamp to the first or last point without extra branches.
+
+    Args:
+        x: Position to evaluate
+        xs: Ascending x coordinates, at least two points
+        values: Interleaved (warm, cool) brightness at each x
+        slopes: Interleaved (warm, cool) slope of each segment, 0 for
+            zero-length segments
+
+    Returns:
+        Tuple of (warm, cool) at x
+    """
+    # Segment ending at the first point strictly after x, kept within the
+    # padded range; the sentinel segments have slope 0
+    i = max(1, min(len(xs) - 1, bisect_right(xs, x)))
+
+    # One multiply-add per channel, both read from adjacent slots
+    dt = x - xs[i - 1]
+    j = 2 * (i - 1)
+    return (values[j] + slopes[j] * dt, values[j + 1] + slopes[j + 1] * dt)
+
+
 class TransitionEngine:
     """Calculates brightness targets based on schedule position.
 
-    Reads schedule entries from ScheduleManager and interpolates brightness
-    values based on current time. Updates LEDDriver with calculated targets.
+    Receives schedule entries from ScheduleManager whenever they change and
+    interpolates brightness values based on current time. Updates LEDDriver
+    with calculated targets.
 
     Attributes:
-        _schedule: ScheduleManager instance for reading schedule entries
+        _schedule: ScheduleManager instance providing schedule updates
         _leds: LEDDriver instance for setting brightness
+        _is_demo: Whether the cached schedule loops as a demo cycle
+        _cycle_duration: Demo cycle length in seconds
+        _entries: Entries object the cache was built from
+        _compute: Function mapping an optional unix time to (warm, cool),
+            specialised for the current schedule by _make_compute
     """
 
+    __slots__ = (
+        '_schedule', '_leds', '_is_demo', '_cycle_duration', '_entries', '_compute',
+    )
+
     # Default night light brightness when no schedule available
     NIGHT_LIGHT_WARM: float = 0.25
     NIGHT_LIGHT_COOL: float = 0.0
 
+    # Targets that match the LEDs' current state at this many steps per
+    # channel are not re-sent to the driver
+    WRITE_RESOLUTION: int = 4095
+
     def __init__(self, schedule_manager: ScheduleManager, led_driver: LEDDriver) -> None:
         """Initialize TransitionEngine with schedule manager and LED driver.
 
+        Registers for schedule changes and seeds the cached state from the
+        schedule manager's current schedule.
+
         Args:
-            schedule_manager: ScheduleManager instance for reading schedule entries
+            schedule_manager: ScheduleManager instance providing schedule updates
             led_driver: LEDDriver instance for setting brightness
         """
         self._schedule = schedule_manager
         self._leds = led_driver
+        self._entries = None
+        self._is_demo = False
+        self._cycle_duration = 0
 
-    def update(self) -> None:
-        """Calculate and apply current brightness based on time and schedule.
+        schedule_manager.add_listener(self.on_schedule_changed)
+        self.on_schedule_changed(
+            schedule_manager.get_entries(),
+            schedule_manager.is_demo_mode(),
+            schedule_manager.get_demo_cycle_duration(),
+        )
 
-        Gets the current target brightness from the schedule and applies it
-        to the LED driver. This method should be called periodically by the
-        main controller's timer.
-        """
-        warm, cool = self.get_current_target()
-        self._leds.set_brightness(warm, cool)
+    def on_schedule_changed(self, entries: tuple, is_demo: bool, cycle_duration: float) -> None:
+        """Rebuild the cached schedule state after the schedule changes.
 
-    def get_current_target(self) -> tuple[float, float]:
-        """Calculate brightness target based on current position in schedule.
+        Called by ScheduleManager whenever its cached schedule is replaced,
+        so per-tick updates read only this engine's own attributes.
 
-        Finds the surrounding schedule entries for the current time and
-        performs linear interpolation to determine the target brightness.
+        Args:
+            entries: Tuple of schedule entry dicts with 'unix_time', 'warm',
+                'cool', as returned by ScheduleManager.get_entries(); any
+                empty value means no schedule
+            is_demo: Whether the schedule loops as a demo cycle
+            cycle_duration: Demo cycle length in seconds
+        """
+        # ScheduleManager hands out the same tuple until it replaces the
+        # schedule, so an identical object means nothing to rebuild
+        if (entries is not None and entries is self._entries
+                and is_demo == self._is_demo and cycle_duration == self._cycle_duration):
+            return
+        self._entries = entries
+        self._is_demo = is_demo
+        self._cycle_duration = cycle_duration
+        times: list = []
+        values: list = []
+        slopes: list = []
+
+        def add_point(t: float, warm: float, cool: float) -> None:
+            # Append a point and the slope of the segment ending at it.
+            # Zero-length segments get slope 0; bisect_right never selects one.
+            span = t - times[-1]
+            if span > 0:
+                slopes.append((warm - values[-2]) / span)
+                slopes.append((cool - values[-1]) / span)
+            else:
+                slopes.append(0.0)
+                slopes.append(0.0)
+            times.append(t)
+            values.append(warm)
+            values.append(cool)
+
+        if entries:
+            # Demo mode interpolates over offsets into the cycle
+            first = entries[0]
+            base = first["unix_time"] if is_demo else 0
+
+            # Flat sentinel segments one second either side of the schedule
+            # make every lookup land on an interior segment, so before-first
+            # and past-last need no special cases
+            times.append(first["unix_time"] - base - 1)
+            values.append(first["warm"])
+            values.append(first["cool"])
+
+            for e in entries:
+                add_point(e["unix_time"] - base, e["warm"], e["cool"])
+
+            if is_demo:
+                # Ramp from the last entry back to the first at the end of
+                # the cycle, so the loop needs no wrap-around handling
+                add_point(max(cycle_duration, times[-1]), first["warm"], first["cool"])
+
+            add_point(times[-1] + 1, values[-2], values[-1])
+
+        self._compute = self._make_compute(times, values, slopes)
+
+    def _make_compute(
+        self, times: list, values: list, slopes: list
+    ) -> Callable[[float | None], tuple[float, float]]:
+        """Build the target function for the schedule just installed.
+
+        Choosing between night light, demo and normal interpolation once per
+        schedule change leaves get_current_target with a single call and no
+        per-tick branching on the schedule's state.
 
-        For demo mode, the schedule loops continuously.
+        Args:
+            times: Sentinel-padded point times, empty for no schedule
+            values: Interleaved (warm, cool) brightness at each point
+            slopes: Interleaved (warm, cool) slope of each segment
 
         Returns:
-            Tuple of (warm, cool) brightness values in range 0.0-1.0
+            Function taking now (unix time or None) and returning (warm, cool)
         """
-        entries = self._schedule.get_entries()
-
         # No schedule - fall back to night light
-        if not entries:
+        if not times:
             warm = config.NIGHT_LIGHT_BRIGHTNESS if config else self.NIGHT_LIGHT_WARM
             cool = config.NIGHT_LIGHT_COOL if config else self.NIGHT_LIGHT_COOL
-            return (warm, cool)
-
-        # Handle demo mode with looping
-        if self._schedule.is_demo_mode():
-            return self._get_demo_target(entries)
-
-        now = time.time()
-
-        # Find surrounding entries
-        prev_entry = None
-        next_entry = None
-
-        for i, entry in enumerate(entries):
-            if entry["unix_time"] > now:
-                next_entry = entry
-                prev_entry = entries[i - 1] if i > 0 else None
-                break
-        else:
-            # Past all entries - use last entry's brightness
-            last = entries[-1]
-            return (last["warm"], last["cool"])
-
-        if prev_entry is None:
-            # Before first entry - use first entry's brightness
-            return (next_entry["warm"], next_entry["cool"])
-
-        # Linear interpolation between prev and next
-        duration = next_entry["unix_time"] - prev_entry["unix_time"]
-        elapsed = now - prev_entry["unix_time"]
-
-        # Avoid division by zero (shouldn't happen with valid schedule)
-        if duration <= 0:
-            return (next_entry["warm"], next_entry["cool"])
+            target = (warm, cool)
+            return lambda now: target
+
+        if self._is_demo:
+            # Demo mode loops over the cycle using sub-second elapsed time.
+            # MicroPython's time.time() returns integer seconds, which would
+            # staircase brightness once per second instead of ramping smoothly.
+            elapsed_s = self._schedule.get_demo_elapsed_s
+            cycle_duration = self._cycle_duration
+            return lambda now: _interp(elapsed_s() % cycle_duration, times, values, slopes)
+
+        def compute(now: float | None) -> tuple[float, float]:
+            if now is None:
+                now = time.time()
+            return _interp(now, times, values, slopes)
+        return compute
+
+    def update(self, now: float | None = None, force: bool = False) -> None:
+        """Calculate and apply current brightness based on time and schedule.
 
-        progress = elapsed / duration
+        Gets the current target brightness from the schedule and applies it
+        to the LED driver. This method should be called periodically by the
+        main controller's timer.
 
-        # Clamp progress to [0, 1] for safety
-        progress = max(0.0, min(1.0, progress))
+        On slow segments most ticks land on the same 12-bit step as the LEDs'
+        current brightness; those writes are skipped. The comparison is made
+        against the driver's own state, so a night light fallback set
+        elsewhere is always overwritten on the next update.
 
-        warm = prev_entry["warm"] + (next_entry["warm"] - prev_entry["warm"]) * progress
-        cool = prev_entry["cool"] + (next_entry["cool"] - prev_entry["cool"]) * progress
+        Args:
+            now: Unix time to evaluate at, or None to read time.time(). Lets a
+                caller driving several engines read the clock once per tick.
+            force: Write to the LEDs even if the target is unchanged
+        """
+        warm, cool = self._compute(now)
+        if not force:
+            res = self.WRITE_RESOLUTION
+            cur_warm, cur_cool = self._leds.get_brightness()
+            if int(warm * res) == int(cur_warm * res) and int(cool * res) == int(cur_cool * res):
+                return
+        self._leds.set_brightness(warm, cool)
 
-        return (warm, cool)
+    def get_current_target(self, now: float | None = None) -> tuple[float, float]:
+        """Calculate brightness target based on current position in schedule.
 
-    def _get_demo_target(self, entries: list) -> tuple[float, float]:
-        """Calculate brightness target for demo mode with looping.
+        Finds the surrounding schedule entries for the current time and
+        performs linear interpolation to determine the target brightness.
 
-        Demo mode continuously loops through the schedule based on
-        elapsed time modulo the cycle duration.
+        For demo mode, the schedule loops continuously. Its position comes from
+        the schedule's own elapsed-time reference, so now is not used there.
 
         Args:
-            entries: List of schedule entries
+            now: Unix time to evaluate at, or None to read time.time()
 
         Returns:
             Tuple of (warm, cool) brightness values in range 0.0-1.0
         """
-        cycle_duration = self._schedule.get_demo_cycle_duration()
-        cycle_start = entries[0]["unix_time"]
-
-        # Use sub-second precision elapsed time for smooth interpolation.
-        # MicroPython's time.time() returns integer seconds, which causes
-        # brightness to staircase once per second instead of ramping smoothly.
-        elapsed_total = self._schedule.get_demo_elapsed_s()
-        cycle_time = elapsed_total % cycle_duration
-
-        # Find surrounding entries based on relative offset within cycle
-        prev_entry = entries[-1]  # Default to last if before first
-        next_entry = entries[0]   # Default to first
-
-        for i, entry in enumerate(entries):
-            # Calculate relative offset from cycle start
-            entry_offset = entry["unix_time"] - cycle_start
-            if entry_offset > cycle_time:
-                next_entry = entry
-                prev_entry = entries[i - 1] if i > 0 else entries[-1]
-                break
-        else:
-            # Past all entries in this cycle, wrapping to start
-            prev_entry = entries[-1]
-            next_entry = entries[0]
-
-        # Calculate interpolation progress
-        prev_offset = prev_entry["unix_time"] - cycle_start
-        next_offset = next_entry["unix_time"] - cycle_start
-
-        # Handle wrap-around at end of cycle
-        if next_offset <= prev_offset:
-            next_offset += cycle_duration
-        if cycle_time < prev_offset:
-            cycle_time += cycle_duration
-
-        duration = next_offset - prev_offset
-        if duration <= 0:
-            return (next_entry["warm"], next_entry["cool"])
-
-        progress = (cycle_time - prev_offset) / duration
-        progress = max(0.0, min(1.0, progress))
-
-        warm = prev_entry["warm"] + (next_entry["warm"] - prev_entry["warm"]) * progress
-        cool = prev_entry["cool"] + (next_entry["cool"] - prev_entry["cool"]) * progress
-
-        return (warm, cool)
+        return self._compute(now)